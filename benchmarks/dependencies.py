@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from tdd_project.usecases.product import ProductUsecase, get_product_usecase
+
+app = FastAPI()
+
+
+@app.get("/per-request")
+async def per_request(usecase: ProductUsecase = Depends()) -> dict:
+    return {"collection": usecase.collection.name}
+
+
+@app.get("/shared")
+async def shared(usecase: ProductUsecase = Depends(get_product_usecase)) -> dict:
+    return {"collection": usecase.collection.name}
+
+
+async def run(requests: int) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/per-request", "/shared"):
+            for _ in range(100):
+                await client.get(path)
+
+            start = time.perf_counter()
+            for _ in range(requests):
+                await client.get(path)
+            elapsed = time.perf_counter() - start
+            print(f"{path:>12}: {elapsed / requests * 1_000_000:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dependency overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
@@ -0,0 +1,91 @@
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+
+from tdd_project.core.config import settings
+from tdd_project.schemas.product import ProductOut
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, only used for comparison
+    orjson = None
+
+
+def products(count: int) -> List[ProductOut]:
+    now = datetime.utcnow()
+    return [
+        ProductOut(
+            id=uuid4(),
+            created_at=now,
+            updated_at=now,
+            name=f"Product {index:05d}",
+            quantity=index % 100,
+            price=Decimal(f"{index % 1000}.{index % 1000:03d}"),
+            status=index % 2 == 0,
+            version=1,
+        )
+        for index in range(count)
+    ]
+
+
+def stdlib(content: List[ProductOut]) -> bytes:
+    # FastAPI's default JSONResponse path.
+    return json.dumps(jsonable_encoder(content)).encode()
+
+
+def pydantic_core(content: List[ProductOut]) -> bytes:
+    return to_json(content)
+
+
+def orjson_dumps(content: List[ProductOut]) -> bytes:
+    # orjson has no Decimal support, so models have to be dumped first.
+    return orjson.dumps([item.model_dump() for item in content], default=str)
+
+
+def bench(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(counts: List[int], repeat: int) -> None:
+    encoders = [("stdlib json", stdlib), ("pydantic-core", pydantic_core)]
+    if orjson is not None:
+        encoders.append(("orjson", orjson_dumps))
+
+    print(
+        f"{'products':>9} {'encoder':<14}{'encode ms':>11}"
+        f"{'bytes':>11}{'gzip bytes':>12}{'gzip ms':>9}"
+    )
+    for count in counts:
+        content = products(count)
+        times = max(repeat * 1000 // count, 3)
+        for name, encode in encoders:
+            body = encode(content)
+            encode_time = bench(lambda: encode(content), times)
+            compress = lambda: gzip.compress(  # noqa: E731
+                body, compresslevel=settings.GZIP_COMPRESS_LEVEL
+            )
+            compressed = compress()
+            compress_time = bench(compress, times)
+            print(
+                f"{count:>9} {name:<14}{encode_time * 1000:>11.2f}{len(body):>11}"
+                f"{len(compressed):>12}{compress_time * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Listing encoding benchmark")
+    parser.add_argument("--count", type=int, action="append", dest="counts")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.counts or [1_000, 10_000], args.repeat)
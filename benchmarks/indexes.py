@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+from typing import Awaitable, Callable, List
+
+from tdd_project.db.mongo import db_client
+from tdd_project.models.product import ProductModel
+from tdd_project.usecases.product import visible
+
+
+def make_products(count: int) -> List[dict]:
+    return [
+        ProductModel(
+            name=f"Product {i}",
+            quantity=random.randint(0, 100),
+            price=Decimal(random.randint(100, 1_000_000)) / 100,
+            status=random.random() < 0.8,
+        ).model_dump()
+        for i in range(count)
+    ]
+
+
+async def leaf_stage(collection, filters: dict) -> str:
+    plan = await collection.find(filters).explain()
+    stage = plan["queryPlanner"]["winningPlan"]
+    # Slot-based engine plans nest the classic plan under queryPlan.
+    stage = stage.get("queryPlan", stage)
+    while "inputStage" in stage:
+        stage = stage["inputStage"]
+    return stage["stage"]
+
+
+async def timed(fn: Callable[[], Awaitable], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def run(count: int, repeat: int) -> None:
+    database = db_client.get().get_database()
+    collection = database[f"{ProductModel.collection_name}_bench"]
+    await collection.drop()
+
+    products = make_products(count)
+    await collection.insert_many(products)
+    ids = [product["id"] for product in random.sample(products, repeat)]
+    # The same filters the app sends; the partial indexes need the deleted_at
+    # predicate that visible() adds.
+    price_range = visible({"price": {"$gt": Decimal("100"), "$lt": Decimal("110")}})
+
+    async def by_id() -> None:
+        await collection.find_one(visible({"id": random.choice(ids)}))
+
+    async def by_price() -> None:
+        await collection.find(price_range).to_list(length=None)
+
+    print(f"{count} products, {repeat} lookups per scenario (ms/op)")
+    for label in ("without indexes", "with indexes"):
+        if label == "with indexes":
+            await collection.create_indexes(ProductModel.indexes)
+        id_plan = await leaf_stage(collection, visible({"id": ids[0]}))
+        price_plan = await leaf_stage(collection, price_range)
+        print(
+            f"{label:>16}: by id {await timed(by_id, repeat):8.3f} ({id_plan})"
+            f"  by price {await timed(by_price, repeat):8.3f} ({price_plan})"
+        )
+
+    await collection.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index lookup benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.repeat))
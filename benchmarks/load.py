@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from httpx import ASGITransport, AsyncClient
+
+from tdd_project.db.indexes import ensure_indexes
+from tdd_project.db.mongo import db_client
+from tdd_project.models.product import ProductModel
+from tdd_project.schemas.product import ProductBulkIn
+from tdd_project.usecases.product import product_usecase
+from tests.factories import many_products_data
+
+Request = Callable[[AsyncClient], Awaitable[int]]
+
+
+class Exhausted(Exception):
+    pass
+
+
+def draw(ids: Iterator[str], size: Optional[int] = None):
+    chunk = list(itertools.islice(ids, size or 1))
+    if not chunk:
+        raise Exhausted
+    return chunk if size else chunk[0]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    latencies_ms: List[float] = field(repr=False)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": self.requests / self.seconds if self.seconds else 0.0,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+        }
+
+
+def percentile(ordered: List[float], rank: float) -> float:
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(rank / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def seed(count: int, fresh: bool, batch: int = 10_000) -> List[str]:
+    if fresh:
+        await product_usecase.collection.drop()
+    await ensure_indexes(db_client.get().get_database())
+
+    ids = []
+    data = many_products_data(count)
+    while chunk := list(itertools.islice(data, batch)):
+        results = await product_usecase.create_many(
+            [ProductBulkIn(**product) for product in chunk]
+        )
+        ids.extend(str(result.id) for result in results)
+    product_usecase.cache.clear()
+    return ids
+
+
+def scenarios(ids: List[str], bulk_size: int) -> Dict[str, Request]:
+    product = next(many_products_data(1))
+    # Destructive scenarios draw from their own pools so they never collide.
+    pool = ids[:]
+    random.shuffle(pool)
+    deletes = iter(pool[: len(pool) // 4])
+    bulk_deletes = iter(pool[len(pool) // 4 : len(pool) // 2])
+    reads = pool[len(pool) // 2 :] or ids
+
+    def request(method: str, url: Callable[[], str], json=None) -> Request:
+        async def send(client: AsyncClient) -> int:
+            body = json() if callable(json) else json
+            response = await client.request(method, url(), json=body)
+            return response.status_code
+
+        return send
+
+    return {
+        "post": request("POST", lambda: "/products/", json=product),
+        "post_bulk": request(
+            "POST", lambda: "/products/bulk", json=[product] * bulk_size
+        ),
+        "get": request("GET", lambda: f"/products/{random.choice(reads)}"),
+        "get_fields": request(
+            "GET", lambda: f"/products/{random.choice(reads)}?fields=name,price"
+        ),
+        "query_page": request("GET", lambda: "/products/?limit=100"),
+        "query_price": request(
+            "GET", lambda: "/products/?min_price=5&max_price=6&limit=100"
+        ),
+        "query_stream": request("GET", lambda: "/products/?stream=true&max_price=5"),
+        "patch": request(
+            "PATCH", lambda: f"/products/{random.choice(reads)}", json={"quantity": 1}
+        ),
+        "patch_bulk": request(
+            "PATCH",
+            lambda: "/products/bulk",
+            json=[{"id": id, "quantity": 2} for id in reads[:bulk_size]],
+        ),
+        "delete": request("DELETE", lambda: f"/products/{draw(deletes)}"),
+        "delete_bulk": request(
+            "DELETE",
+            lambda: "/products/bulk",
+            json=lambda: {"ids": draw(bulk_deletes, bulk_size)},
+        ),
+    }
+
+
+async def run_scenario(
+    client: AsyncClient, name: str, send: Request, requests: int, concurrency: int
+) -> ScenarioResult:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                status = await send(client)
+            except Exhausted:
+                return
+            except Exception:
+                status = 599
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += status >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ScenarioResult(
+        name, len(latencies), errors, time.perf_counter() - start, latencies
+    )
+
+
+async def wait_for_server(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/docs")
+                return
+            except Exception:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    ids = await seed(args.count, args.fresh)
+    available = scenarios(ids, args.bulk_size)
+    server: Optional[subprocess.Popen] = None
+
+    if args.target == "uvicorn":
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "tdd_project.main:app"]
+            + ["--port", str(args.port), "--no-access-log"]
+        )
+        await wait_for_server(base_url)
+        client = AsyncClient(base_url=base_url, timeout=60)
+    else:
+        client = AsyncClient(
+            transport=ASGITransport(app=load_app()), base_url="http://bench", timeout=60
+        )
+
+    results = {}
+    try:
+        async with client:
+            for name in args.scenario or available:
+                result = await run_scenario(
+                    client, name, available[name], args.requests, args.concurrency
+                )
+                results[name] = result.summary()
+                print_row(name, results[name])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.target,
+            "count": args.count,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "collection": ProductModel.collection_name,
+            "commit": subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+            ).stdout.strip(),
+        },
+        "results": results,
+    }
+
+
+def load_app():
+    from tdd_project.main import app
+
+    return app
+
+
+def print_row(name: str, summary: Dict[str, float]) -> None:
+    print(
+        f"{name:<14}{summary['requests']:>8}{summary['errors']:>7}"
+        f"{summary['rps']:>10.1f}{summary['p50_ms']:>9.2f}"
+        f"{summary['p95_ms']:>9.2f}{summary['p99_ms']:>9.2f}"
+    )
+
+
+def compare(base_path: str, head_path: str, threshold: float) -> int:
+    with open(base_path) as base_file, open(head_path) as head_file:
+        base, head = json.load(base_file)["results"], json.load(head_file)["results"]
+
+    regressions = 0
+    print(f"{'scenario':<14}{'rps':>16}{'p95 ms':>18}")
+    for name in sorted(base.keys() & head.keys()):
+        before, after = base[name], head[name]
+        rps = after["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p95 = after["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        regressed = rps < -threshold or p95 > threshold
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<14}{after['rps']:>9.1f} {rps:>+6.1%}"
+            f"{after['p95_ms']:>11.2f} {p95:>+6.1%}{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Store API load benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("run", help="Seed products and drive every route")
+    bench.add_argument("--count", type=int, default=10_000)
+    bench.add_argument("--requests", type=int, default=1_000)
+    bench.add_argument("--concurrency", type=int, default=32)
+    bench.add_argument("--bulk-size", type=int, default=100)
+    bench.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    bench.add_argument("--port", type=int, default=8765)
+    bench.add_argument("--scenario", action="append")
+    bench.add_argument(
+        "--fresh", action="store_true", help="Drop the products collection first"
+    )
+    bench.add_argument("--output", default="bench_results.json")
+
+    diff = commands.add_parser("compare", help="Diff two result files")
+    diff.add_argument("base")
+    diff.add_argument("head")
+    diff.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return compare(args.base, args.head, args.threshold)
+
+    print(
+        f"{'scenario':<14}{'reqs':>8}{'errors':>7}{'rps':>10}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import argparse
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable, List
+
+import bson
+from bson import Decimal128
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+
+from tdd_project.db.codecs import type_registry
+from tdd_project.models.product import ProductModel
+from tdd_project.schemas.product import ProductIn, ProductOut
+
+PLAIN = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
+LEAN = PLAIN.with_options(type_registry=type_registry)
+
+
+def legacy_document(raw: bytes) -> dict:
+    # What the per-field loops in set_model/set_schema used to do.
+    document = bson.decode(raw, codec_options=PLAIN)
+    for key, value in document.items():
+        if isinstance(value, Decimal128):
+            document[key] = Decimal(str(value))
+    return document
+
+
+def legacy_encode(content: Any) -> bytes:
+    # FastAPI's response_model path: dump, validate again, encode with stdlib json.
+    if isinstance(content, list):
+        content = [ProductOut(**item.model_dump()) for item in content]
+    else:
+        content = ProductOut(**content.model_dump())
+    return json.dumps(jsonable_encoder(content)).encode()
+
+
+def bench(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(count: int, repeat: int) -> None:
+    body = ProductIn(name="Iphone 14 pro Max", quantity=10, price="8.500", status=True)
+    raws = [
+        bson.encode(ProductModel(**dict(body)).model_dump(), codec_options=LEAN)
+        for _ in range(count)
+    ]
+
+    def get_legacy() -> bytes:
+        return legacy_encode(ProductOut(**legacy_document(raws[0])))
+
+    def get_lean() -> bytes:
+        return to_json(ProductOut(**bson.decode(raws[0], codec_options=LEAN)))
+
+    def query_legacy() -> bytes:
+        return legacy_encode([ProductOut(**legacy_document(raw)) for raw in raws])
+
+    def query_lean() -> bytes:
+        return to_json(
+            [ProductOut(**bson.decode(raw, codec_options=LEAN)) for raw in raws]
+        )
+
+    def create_legacy() -> bytes:
+        model = ProductModel(**body.model_dump())
+        return legacy_encode(ProductOut(**model.model_dump()))
+
+    def create_lean() -> bytes:
+        model = ProductModel(**dict(body))
+        return to_json(ProductOut.model_construct(**dict(model)))
+
+    scenarios: List[tuple[str, Callable, Callable, int]] = [
+        ("GET /products/{id}", get_legacy, get_lean, repeat),
+        (f"GET /products/ ({count})", query_legacy, query_lean, max(repeat // 100, 3)),
+        ("POST /products/", create_legacy, create_lean, repeat),
+    ]
+    print(f"{'endpoint':<24}{'legacy ops/s':>14}{'lean ops/s':>14}{'speedup':>10}")
+    for name, legacy, lean, times in scenarios:
+        before, after = bench(legacy, times), bench(lean, times)
+        print(f"{name:<24}{1 / before:>14.0f}{1 / after:>14.0f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization benchmark")
+    parser.add_argument("--count", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
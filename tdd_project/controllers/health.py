@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, status
+
+from tdd_project.core.health import readiness
+
+router = APIRouter(tags=["health"])
+
+
+@router.get(path="/live", status_code=status.HTTP_200_OK)
+async def live() -> dict:
+    if readiness.failed:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=readiness.error
+        )
+    return {"status": "ok"}
+
+
+@router.get(path="/ready", status_code=status.HTTP_200_OK)
+async def ready() -> dict:
+    if not readiness.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=readiness.error or "Warming up",
+        )
+    return {"status": "ready", "warmup_seconds": readiness.steps}
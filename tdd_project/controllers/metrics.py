@@ -0,0 +1,62 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from tdd_project.core.metrics import metrics, render_counters, render_gauges
+from tdd_project.core.middleware import concurrency
+from tdd_project.db.mongo import db_client
+from tdd_project.usecases.events import product_events, product_feed
+from tdd_project.usecases.product import product_cache, product_flight
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    path="/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def get() -> PlainTextResponse:
+    lines = metrics.render()
+    pool = db_client.pool_metrics.snapshot()
+    lines += render_gauges(
+        "mongo_pool",
+        {name: pool.pop(name) for name in ("connections_open", "connections_in_use")},
+    )
+    lines += render_counters("mongo_pool", pool)
+    lines += render_counters(
+        "product_cache",
+        {
+            "hits": product_cache.stats.hits,
+            "misses": product_cache.stats.misses,
+            "evictions": product_cache.stats.evictions,
+        },
+    )
+    lines += render_gauges("product_cache", {"entries": len(product_cache)})
+    lines += render_counters(
+        "product_singleflight",
+        {
+            "executed": product_flight.stats.executed,
+            "coalesced": product_flight.stats.coalesced,
+        },
+    )
+    lines += render_gauges("product_singleflight", {"in_flight": len(product_flight)})
+    lines += render_counters(
+        "product_events",
+        {"published": product_events.published, "dropped": product_events.dropped},
+    )
+    lines += render_gauges(
+        "product_events",
+        {
+            "running": int(product_feed.running),
+            "subscribers": len(product_events.subscribers),
+        },
+    )
+    lines += render_counters("http_concurrency", {"rejected": concurrency.rejected})
+    lines += render_gauges(
+        "http_concurrency",
+        {"in_flight": concurrency.in_flight, "waiting": concurrency.waiting},
+    )
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
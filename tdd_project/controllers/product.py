@@ -1,34 +1,376 @@
-from typing import List, Optional
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
+import asyncio
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from pydantic import UUID4
-from tdd_project.schemas.product import ProductIn, ProductOut, ProductUpdate
-from tdd_project.usecases.product import ProductUsecase
-from tdd_project.core.exceptions import NotFoundException, InsertionErrorException
+from pydantic import UUID4, BaseModel
+from tdd_project.core.config import settings
+from tdd_project.core.events import CLOSED, EventBroker
+from tdd_project.core.http import (
+    conditional_response,
+    etag,
+    json_response,
+    list_etag,
+    parse_if_match,
+)
+from tdd_project.core.pagination import encode_cursor
+from tdd_project.db.mongo import db_client
+from tdd_project.db.routing import (
+    apply_causal_token,
+    current_session,
+    encode_causal_token,
+)
+from tdd_project.schemas.filters import ProductFilter
+from tdd_project.schemas.product import (
+    BulkResult,
+    ProductBulkDelete,
+    ProductBulkIn,
+    ProductBulkStock,
+    ProductBulkUpdate,
+    ProductIn,
+    ProductLookup,
+    ProductLookupItem,
+    ProductOut,
+    ProductStats,
+    ProductUpdate,
+    StockAdjustment,
+    parse_fields,
+)
+from tdd_project.usecases.idempotency import (
+    IdempotencyUsecase,
+    get_idempotency_usecase,
+)
+from tdd_project.usecases.events import product_events, product_feed
+from tdd_project.usecases.product import ProductUsecase, get_product_usecase
+from tdd_project.core.exceptions import (
+    ConflictException,
+    IdempotencyKeyReusedException,
+    InsertionErrorException,
+    InsufficientStockException,
+    InvalidQueryException,
+    NotFoundException,
+    PreconditionFailedException,
+    QueryTimeoutException,
+)
 
 
-router = APIRouter(tags=["products"])
+# POST routes that only read.
+READ_ROUTES = {"lookup"}
+
+
+async def _causal_session(
+    request: Request, x_causal_token: Optional[str] = Header(None)
+) -> AsyncIterator[None]:
+    # Writes hand out X-Causal-Token; reads sending it back see those writes,
+    # even from a secondary. Other reads stay on the cached, sessionless path.
+    route = getattr(request.scope.get("route"), "name", None)
+    reading = request.method == "GET" or route in READ_ROUTES
+    if reading and x_causal_token is None:
+        yield
+        return
+
+    async with await db_client.get().start_session(causal_consistency=True) as session:
+        if x_causal_token is not None:
+            try:
+                apply_causal_token(session, x_causal_token)
+            except InvalidQueryException as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message
+                )
+        reset = current_session.set(session)
+        try:
+            yield
+        finally:
+            current_session.reset(reset)
+
+
+def _causal(headers: Optional[dict] = None) -> dict:
+    headers = dict(headers or {})
+    session = current_session.get()
+    token = encode_causal_token(session) if session is not None else None
+    if token is not None:
+        headers["X-Causal-Token"] = token
+    return headers
+
+
+def _timeout(exc: QueryTimeoutException) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=exc.message,
+        headers={"Retry-After": str(settings.RETRY_AFTER_SECONDS)},
+    )
+
+
+def _cache_control(public: str, include_deleted: bool) -> str:
+    return settings.CACHE_CONTROL_ARCHIVED if include_deleted else public
+
+
+router = APIRouter(tags=["products"], dependencies=[Depends(_causal_session)])
 
 
 @router.post(path="/", status_code=status.HTTP_201_CREATED)
 async def post(
-    body: ProductIn = Body(...), usecase: ProductUsecase = Depends()
+    body: ProductIn = Body(...),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
+) -> ProductOut:
+    async def create() -> Response:
+        try:
+            product = await usecase.create(body=body)
+        except InsertionErrorException as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message
+            )
+
+        return json_response(
+            product,
+            status_code=status.HTTP_201_CREATED,
+            headers=_causal({"ETag": etag(product.version)}),
+        )
+
+    return await _idempotent(
+        idempotency, "POST /products/", idempotency_key, body, create
+    )
+
+
+@router.post(path="/bulk", status_code=status.HTTP_200_OK)
+async def post_bulk(
+    body: List[ProductBulkIn] = Body(..., max_length=settings.BULK_MAX_ITEMS),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
+) -> BulkResult:
+    async def create_many() -> Response:
+        results = await usecase.create_many(body)
+        return json_response(BulkResult.from_items(results), headers=_causal())
+
+    return await _idempotent(
+        idempotency, "POST /products/bulk", idempotency_key, body, create_many
+    )
+
+
+@router.patch(path="/bulk", status_code=status.HTTP_200_OK)
+async def patch_bulk(
+    body: List[ProductBulkUpdate] = Body(..., max_length=settings.BULK_MAX_ITEMS),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
+) -> BulkResult:
+    async def update_many() -> Response:
+        results = await usecase.update_many(body)
+        return json_response(BulkResult.from_items(results), headers=_causal())
+
+    return await _idempotent(
+        idempotency, "PATCH /products/bulk", idempotency_key, body, update_many
+    )
+
+
+@router.delete(path="/bulk", status_code=status.HTTP_200_OK)
+async def delete_bulk(
+    body: ProductBulkDelete = Body(...),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
+) -> BulkResult:
+    async def delete_many() -> Response:
+        results = await usecase.delete_many(body.ids)
+        return json_response(BulkResult.from_items(results), headers=_causal())
+
+    return await _idempotent(
+        idempotency, "DELETE /products/bulk", idempotency_key, body, delete_many
+    )
+
+
+@router.post(path="/bulk/stock", status_code=status.HTTP_200_OK)
+async def post_bulk_stock(
+    body: List[ProductBulkStock] = Body(..., max_length=settings.BULK_MAX_ITEMS),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
+) -> BulkResult:
+    async def adjust_stock_many() -> Response:
+        results = await usecase.adjust_stock_many(body)
+        return json_response(BulkResult.from_items(results), headers=_causal())
+
+    return await _idempotent(
+        idempotency,
+        "POST /products/bulk/stock",
+        idempotency_key,
+        body,
+        adjust_stock_many,
+    )
+
+
+@router.post(path="/{id}/stock", status_code=status.HTTP_200_OK)
+async def post_stock(
+    id: UUID4 = Path(alias="id"),
+    body: StockAdjustment = Body(...),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+    idempotency: IdempotencyUsecase = Depends(get_idempotency_usecase),
 ) -> ProductOut:
+    async def adjust_stock() -> Response:
+        try:
+            product = await usecase.adjust_stock(id, body.delta)
+        except NotFoundException as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=exc.message
+            )
+        except InsufficientStockException as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=exc.message
+            )
+
+        return json_response(product, headers=_causal({"ETag": etag(product.version)}))
+
+    return await _idempotent(
+        idempotency, f"POST /products/{id}/stock", idempotency_key, body, adjust_stock
+    )
+
+
+@router.post(path="/lookup", status_code=status.HTTP_200_OK)
+async def lookup(
+    body: ProductLookup = Body(...),
+    fields: Optional[str] = Query(None, description="Comma separated fields"),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> List[ProductLookupItem]:
+    try:
+        items = await usecase.lookup(body.ids, fields=parse_fields(fields))
+    except InvalidQueryException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+    except QueryTimeoutException as exc:
+        raise _timeout(exc)
+
+    return json_response(items)
+
+
+async def _idempotent(
+    idempotency: IdempotencyUsecase,
+    scope: str,
+    key: Optional[str],
+    body: Any,
+    handler: Callable[[], Awaitable[Response]],
+) -> Response:
+    try:
+        return await idempotency.run(scope, key, body, handler)
+    except ConflictException as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=exc.message)
+    except IdempotencyKeyReusedException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.message
+        )
+
+
+@router.get(path="/stats", status_code=status.HTTP_200_OK)
+async def stats(
+    buckets: int = Query(5, ge=1, le=50, description="Automatic price buckets"),
+    price_boundaries: Optional[List[Decimal]] = Query(
+        None, description="Explicit ascending price bucket boundaries"
+    ),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductStats:
     try:
-        return await usecase.create(body=body)
-    except InsertionErrorException as exc:
+        result = await usecase.stats(buckets=buckets, boundaries=price_boundaries)
+    except InvalidQueryException as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+    except QueryTimeoutException as exc:
+        raise _timeout(exc)
+
+    return json_response(result)
+
+
+@router.get(path="/search", status_code=status.HTTP_200_OK)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    prefix: bool = Query(False, description="Match names starting with q"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> List[ProductOut]:
+    try:
+        results = await usecase.search(q, prefix=prefix, limit=limit, offset=offset)
+    except QueryTimeoutException as exc:
+        raise _timeout(exc)
+
+    return json_response(results)
+
+
+@router.get(path="/events", status_code=status.HTTP_200_OK)
+async def events(last_event_id: Optional[str] = Header(None)) -> StreamingResponse:
+    if not product_feed.running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product change feed is not running",
+        )
+
+    queue = product_events.subscribe(last_event_id)
+    return StreamingResponse(
+        _sse(product_events, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse(broker: EventBroker, queue: asyncio.Queue) -> AsyncIterator[str]:
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), settings.EVENTS_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is CLOSED:
+                return
+            yield event.render()
+    finally:
+        broker.unsubscribe(queue)
 
 
 @router.get(path="/{id}", status_code=status.HTTP_200_OK)
 async def get(
-    id: UUID4 = Path(alias="id"), usecase: ProductUsecase = Depends()
+    id: UUID4 = Path(alias="id"),
+    fields: Optional[str] = Query(None, description="Comma separated fields"),
+    include_deleted: bool = Query(False, description="Include deleted products"),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    usecase: ProductUsecase = Depends(get_product_usecase),
 ) -> ProductOut:
     try:
-        return await usecase.get(id=id)
+        projected = parse_fields(fields)
+        product = await usecase.get(
+            id=id, fields=projected, include_deleted=include_deleted
+        )
+    except InvalidQueryException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+    except QueryTimeoutException as exc:
+        raise _timeout(exc)
     except NotFoundException as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
 
+    return conditional_response(
+        product,
+        etag(product.version, projected),
+        product.updated_at,
+        _cache_control(settings.CACHE_CONTROL_PRODUCT, include_deleted),
+        if_none_match,
+        if_modified_since,
+    )
+
 
 # @router.get(path="/", status_code=status.HTTP_200_OK)
 # async def query(usecase: ProductUsecase = Depends()) -> List[ProductOut]:
@@ -37,37 +379,91 @@ async def get(
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def query(
-    min_price: Optional[int] = Query(None),
-    max_price: Optional[int] = Query(None),
-    usecase: ProductUsecase = Depends(),
+    filters: ProductFilter = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=settings.QUERY_MAX_RESULTS),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream results as NDJSON"),
+    fields: Optional[str] = Query(None, description="Comma separated fields"),
+    include_deleted: bool = Query(False, description="Include deleted products"),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    usecase: ProductUsecase = Depends(get_product_usecase),
 ) -> List[ProductOut]:
-    filters = {}
-    if min_price is not None and max_price is not None:
-        filters["price"] = {"$gt": min_price, "$lt": max_price}
-    elif min_price is not None:
-        filters["price"] = {"$gt": min_price}
-    elif max_price is not None:
-        filters["price"] = {"$lt": max_price}
-    return await usecase.query(filters)
+    try:
+        query = filters.compile()
+        projected = parse_fields(fields)
+        if stream:
+            products = usecase.stream(
+                query, after=after, fields=projected, include_deleted=include_deleted
+            )
+            return StreamingResponse(
+                _ndjson(products), media_type="application/x-ndjson"
+            )
+
+        results = await usecase.query(
+            query,
+            limit=limit,
+            after=after,
+            fields=projected,
+            include_deleted=include_deleted,
+        )
+    except InvalidQueryException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+    except QueryTimeoutException as exc:
+        raise _timeout(exc)
+
+    headers = {}
+    # Unbounded listings are capped too, so they page the same way.
+    if len(results) == (limit or settings.QUERY_MAX_RESULTS):
+        last = results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    # Deletes cannot move max(updated_at) forward, so only the ETag is a safe
+    # validator for a list and Last-Modified is not sent.
+    return conditional_response(
+        results,
+        list_etag(results, projected),
+        None,
+        _cache_control(settings.CACHE_CONTROL_LIST, include_deleted),
+        if_none_match,
+        if_modified_since,
+        headers=headers,
+    )
+
+
+async def _ndjson(products: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    async for product in products:
+        yield product.model_dump_json() + "\n"
 
 
 @router.patch(path="/{id}", status_code=status.HTTP_200_OK)
 async def patch(
     id: UUID4 = Path(alias="id"),
     body: ProductUpdate = Body(...),
-    usecase: ProductUsecase = Depends(),
+    if_match: Optional[str] = Header(None),
+    usecase: ProductUsecase = Depends(get_product_usecase),
 ) -> ProductOut:
     try:
-        return await usecase.update(id=id, body=body)
+        product = await usecase.update(
+            id=id, body=body, version=parse_if_match(if_match)
+        )
     except NotFoundException as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    except PreconditionFailedException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=exc.message
+        )
+
+    return json_response(product, headers=_causal({"ETag": etag(product.version)}))
 
 
 @router.delete(path="/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(
-    id: UUID4 = Path(alias="id"), usecase: ProductUsecase = Depends()
+    response: Response,
+    id: UUID4 = Path(alias="id"),
+    usecase: ProductUsecase = Depends(get_product_usecase),
 ) -> None:
     try:
         await usecase.delete(id=id)
     except NotFoundException as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    response.headers.update(_causal())
@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Protocol
+
+MISSING = object()
+NOT_FOUND = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class Cache(Protocol):
+    stats: CacheStats
+    generation: int
+
+    def __contains__(self, key: Hashable) -> bool:
+        ...
+
+    def get(self, key: Hashable) -> Any:
+        ...
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        since: Optional[int] = None,
+    ) -> None:
+        ...
+
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Readers pass the generation they started at as `since`, so a value
+        # read before a write to its key is not cached after that write. Keys
+        # dropped from _changed count as changed at the newest dropped one.
+        self.generation = 0
+        self._floor = 0
+        self._changed: OrderedDict[Hashable, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Does not count as a hit or refresh the entry's recency.
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        since: Optional[int] = None,
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        if since is None:
+            self._change(key)
+        elif self._changed.get(key, self._floor) > since:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+        self._change(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.generation += 1
+        self._floor = self.generation
+        self._changed.clear()
+
+    def _change(self, key: Hashable) -> None:
+        self.generation += 1
+        self._changed[key] = self.generation
+        self._changed.move_to_end(key)
+        while len(self._changed) > self.maxsize:
+            _, generation = self._changed.popitem(last=False)
+            self._floor = max(self._floor, generation)
@@ -1,3 +1,4 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +8,94 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Defaults to one worker per available CPU.
+    WEB_CONCURRENCY: Optional[int] = None
+
+    WARMUP_CONNECTIONS: int = 10
+    WARMUP_CACHE_SIZE: int = 1000
+    # Mongo may still be coming up during a deploy. A worker that cannot warm
+    # up within the attempts fails liveness so it gets restarted.
+    WARMUP_ATTEMPTS: int = 10
+    WARMUP_BACKOFF_SECONDS: float = 0.5
+    WARMUP_BACKOFF_MAX_SECONDS: float = 30.0
+
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30_000
+    # Comma separated, e.g. "zstd,snappy"; needs the zstandard/python-snappy extras.
+    MONGO_COMPRESSORS: Optional[str] = None
+    MONGO_READ_PREFERENCE: str = "primary"
+    # Per usecase operation; anything not listed reads with MONGO_READ_PREFERENCE.
+    MONGO_READ_ROUTES: Dict[str, str] = {
+        "query": "secondaryPreferred",
+        "stream": "secondaryPreferred",
+        "search": "secondaryPreferred",
+        "stats": "secondaryPreferred",
+    }
+    # MongoDB refuses values below 90 seconds.
+    MONGO_MAX_STALENESS_SECONDS: int = 90
+    MONGO_SLOW_QUERY_MS: float = 100.0
+
+    BULK_BATCH_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 10_000
+    # Connections one bulk stock request may hold at once.
+    BULK_STOCK_CONCURRENCY: int = 8
+    LOOKUP_MAX_IDS: int = 200
+
+    PRODUCT_CACHE_SIZE: int = 10_000
+    PRODUCT_CACHE_TTL: float = 60.0
+    PRODUCT_CACHE_NEGATIVE_TTL: float = 5.0
+    # Concurrent identical reads share one Mongo call.
+    SINGLE_FLIGHT: bool = True
+
+    # Server-side time budget per usecase read, in milliseconds.
+    QUERY_MAX_TIME_MS: Dict[str, int] = {
+        "get": 500,
+        "lookup": 1_000,
+        "query": 2_000,
+        "stream": 60_000,
+        "search": 200,
+        "stats": 5_000,
+    }
+    # Largest page GET /products/ returns, and the most ?limit= may ask for.
+    QUERY_MAX_RESULTS: int = 10_000
+
+    # Per worker. Requests beyond the limit queue; a full queue answers 503.
+    MAX_CONCURRENT_REQUESTS: int = 256
+    MAX_QUEUED_REQUESTS: int = 512
+    QUEUE_TIMEOUT_SECONDS: float = 5.0
+    RETRY_AFTER_SECONDS: int = 1
+
+    CACHE_CONTROL_PRODUCT: str = "public, max-age=60"
+    CACHE_CONTROL_LIST: str = "public, max-age=10"
+    # include_deleted views are for admins; shared caches must not keep them.
+    CACHE_CONTROL_ARCHIVED: str = "private, no-store"
+
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+
+    # Change streams need a replica set; the feed stops itself on standalones.
+    EVENTS_ENABLED: bool = True
+    # Pre-images let delete events name the product (MongoDB 6.0+).
+    EVENTS_PRE_IMAGES: bool = True
+    EVENTS_QUEUE_SIZE: int = 1000
+    EVENTS_HISTORY_SIZE: int = 1000
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_RETRY_SECONDS: float = 5.0
+    EVENTS_TOKEN_SAVE_SECONDS: float = 1.0
+
+    # Deletes only set deleted_at; a TTL index purges the documents later.
+    SOFT_DELETE: bool = True
+    SOFT_DELETE_RETENTION_SECONDS: int = 30 * 24 * 60 * 60
+
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    # A key still pending after this long belongs to a request that died.
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0
+
     model_config = SettingsConfigDict(env_file=".env")  # Ou ".venv"?
 
+
 settings = Settings()
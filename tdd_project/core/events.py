@@ -0,0 +1,61 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Set
+
+CLOSED = object()
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    name: str
+    data: str
+
+    def render(self) -> str:
+        return f"id: {self.id}\nevent: {self.name}\ndata: {self.data}\n\n"
+
+
+class EventBroker:
+    def __init__(self, queue_size: int, history_size: int) -> None:
+        self.queue_size = queue_size
+        self.history: deque[Event] = deque(maxlen=history_size)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if last_event_id is not None:
+            ids = [event.id for event in self.history]
+            if last_event_id in ids:
+                missed = list(self.history)[ids.index(last_event_id) + 1 :]
+                for event in missed[-self.queue_size :]:
+                    queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, event: Event) -> None:
+        self.history.append(event)
+        self.published += 1
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A consumer that cannot keep up is cut off instead of being
+                # buffered without bound; it can reconnect with Last-Event-ID.
+                self.close(queue)
+                self.dropped += 1
+
+    def close(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSED)
+
+    def close_all(self) -> None:
+        for queue in list(self.subscribers):
+            self.close(queue)
@@ -10,5 +10,29 @@ class NotFoundException(BaseException):
     message = "Not Found"
 
 
-class InsertionErrorException(Exception):
+class InsertionErrorException(BaseException):
     message = "Insertion Error"
+
+
+class PreconditionFailedException(BaseException):
+    message = "Precondition Failed"
+
+
+class InvalidQueryException(BaseException):
+    message = "Invalid Query"
+
+
+class QueryTimeoutException(BaseException):
+    message = "Query Timeout"
+
+
+class ConflictException(BaseException):
+    message = "Conflict"
+
+
+class InsufficientStockException(BaseException):
+    message = "Insufficient stock"
+
+
+class IdempotencyKeyReusedException(BaseException):
+    message = "Idempotency-Key was already used with a different request"
@@ -0,0 +1,22 @@
+import time
+from typing import Dict, Optional
+
+
+class Readiness:
+    def __init__(self) -> None:
+        self.ready = False
+        self.failed = False
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+
+    def step(self, name: str, started: float) -> None:
+        self.steps[name] = round(time.perf_counter() - started, 4)
+
+    def reset(self) -> None:
+        self.ready = False
+        self.failed = False
+        self.error = None
+        self.steps = {}
+
+
+readiness = Readiness()
@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from tdd_project.core.exceptions import PreconditionFailedException
+
+
+def etag(version: int, fields: Optional[Sequence[str]] = None) -> str:
+    if fields:
+        return f'"{version}-{".".join(fields)}"'
+    return f'"{version}"'
+
+
+def list_etag(items: Sequence[BaseModel], fields: Optional[Sequence[str]]) -> str:
+    digest = hashlib.blake2b(",".join(fields or ()).encode(), digest_size=16)
+    for item in items:
+        digest.update(f"{item.id}:{item.version}:{item.updated_at};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    # Mongo hands back naive datetimes that are in UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    tag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison and takes precedence over dates.
+        tags = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+        return "*" in tags or tag.removeprefix("W/") in tags
+
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # RFC 2822 reads a -0000 zone as "unknown", which parses as naive.
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    if value is None or value.strip() == "*":
+        return None
+
+    tag = value.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise PreconditionFailedException(message=f"Invalid If-Match: {value}")
+    return int(tag)
+
+
+def conditional_response(
+    content: Any,
+    tag: str,
+    last_modified: Optional[datetime],
+    cache_control: str,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    validators = {**(headers or {}), "ETag": tag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        validators["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(tag, last_modified, if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    return json_response(content, headers=validators)
+
+
+class PydanticJSONResponse(JSONResponse):
+    # pydantic-core encodes models, Decimal, UUID and datetime natively.
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def json_response(
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    # Serialise straight from the pydantic models, skipping FastAPI's
+    # response_model re-validation of data the usecase already validated.
+    return PydanticJSONResponse(content, status_code=status_code, headers=headers)
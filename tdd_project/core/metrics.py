@@ -0,0 +1,126 @@
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class RequestTimings:
+    db_seconds: float = 0.0
+    db_commands: int = 0
+    # The request's ASGI scope, where FastAPI records the route it matched.
+    scope: Optional[Mapping[str, Any]] = None
+
+    def describe(self) -> str:
+        if self.scope is None:
+            return "-"
+        route = getattr(self.scope.get("route"), "path", self.scope["path"])
+        return f"{self.scope['method']} {route}"
+
+    def server_timing(self, total: float) -> str:
+        app = max(total - self.db_seconds, 0.0)
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_commands} commands", '
+            f"app;dur={app * 1000:.2f}, total;dur={total * 1000:.2f}"
+        )
+
+
+current_request: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_request", default=None
+)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        prefix = f"{labels}," if labels else ""
+        lines = [
+            f'{name}_bucket{{{prefix}le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class Metrics:
+    def __init__(self) -> None:
+        # Mongo commands are reported from Motor's executor threads.
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.request_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.commands: Dict[str, Histogram] = {}
+        self.command_failures: Dict[str, int] = {}
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_seconds.setdefault((method, route), Histogram()).observe(
+                seconds
+            )
+
+    def observe_command(self, name: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.commands.setdefault(name, Histogram()).observe(seconds)
+            if failed:
+                self.command_failures[name] = self.command_failures.get(name, 0) + 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            lines = ["# TYPE http_requests_total counter"]
+            lines += [
+                f'http_requests_total{{method="{method}",route="{route}",'
+                f'status="{status}"}} {count}'
+                for (method, route, status), count in sorted(self.requests.items())
+            ]
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), histogram in sorted(self.request_seconds.items()):
+                lines += histogram.render(
+                    "http_request_duration_seconds",
+                    f'method="{method}",route="{route}"',
+                )
+            lines.append("# TYPE mongo_command_duration_seconds histogram")
+            for name, histogram in sorted(self.commands.items()):
+                lines += histogram.render(
+                    "mongo_command_duration_seconds", f'command="{name}"'
+                )
+            lines.append("# TYPE mongo_command_failures_total counter")
+            lines += [
+                f'mongo_command_failures_total{{command="{name}"}} {count}'
+                for name, count in sorted(self.command_failures.items())
+            ]
+            return lines
+
+
+def render_gauges(prefix: str, values: Dict[str, float]) -> Iterable[str]:
+    for name, value in values.items():
+        yield f"# TYPE {prefix}_{name} gauge"
+        yield f"{prefix}_{name} {value}"
+
+
+def render_counters(prefix: str, values: Dict[str, float]) -> Iterable[str]:
+    # Counters only go up, so rate() can be taken over them.
+    for name, value in values.items():
+        yield f"# TYPE {prefix}_{name}_total counter"
+        yield f"{prefix}_{name}_total {value}"
+
+
+metrics = Metrics()
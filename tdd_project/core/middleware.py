@@ -0,0 +1,137 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Collection
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tdd_project.core.metrics import RequestTimings, current_request, metrics
+
+
+class TimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope=scope)
+        token = current_request.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", timings.server_timing(time.perf_counter() - start)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            # FastAPI records the matched route, which keeps label cardinality low.
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start,
+            )
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+        uncompressed: Collection[str] = ("/products/events",),
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.uncompressed = tuple(uncompressed)
+
+    # gzip buffers small writes, which would hold Server-Sent Events back.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.uncompressed):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@dataclass
+class ConcurrencyStats:
+    in_flight: int = 0
+    waiting: int = 0
+    rejected: int = 0
+
+
+concurrency = ConcurrencyStats()
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrent: int,
+        max_queued: int,
+        queue_timeout: float,
+        retry_after: int,
+        exempt: Collection[str] = ("/health", "/metrics", "/products/events"),
+        stats: ConcurrencyStats = concurrency,
+    ) -> None:
+        self.app = app
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.exempt = tuple(exempt)
+        self.stats = stats
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.is_exempt(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if self.semaphore.locked() and self.stats.waiting >= self.max_queued:
+            await self.reject(scope, receive, send)
+            return
+
+        self.stats.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            await self.reject(scope, receive, send)
+            return
+        finally:
+            self.stats.waiting -= 1
+
+        self.stats.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.stats.in_flight -= 1
+            self.semaphore.release()
+
+    def is_exempt(self, scope: Scope) -> bool:
+        # Probes must answer under load, and event streams hold a slot forever.
+        # Matched on the path, as anything the client sends could opt out.
+        return scope["path"].startswith(self.exempt)
+
+    async def reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.stats.rejected += 1
+        response = JSONResponse(
+            {"detail": "Server is busy"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,33 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+from uuid import UUID
+
+from tdd_project.core.exceptions import InvalidQueryException
+
+SORT_KEY = [("created_at", 1), ("id", 1)]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    payload = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidQueryException(message=f"Invalid cursor: {cursor}") from exc
+
+
+def after_filter(cursor: str) -> dict[str, Any]:
+    created_at, id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "id": {"$gt": id}},
+        ]
+    }
@@ -0,0 +1,45 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    executed: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            # A task rather than the caller's own coroutine, so one caller
+            # disconnecting does not cancel the call for everyone waiting on it.
+            task = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+            self._calls[key] = task
+            self.stats.executed += 1
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def forget(self, predicate: Callable[[Any], bool]) -> None:
+        # Later callers start a fresh call; those already waiting keep theirs.
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away.
+            task.exception()
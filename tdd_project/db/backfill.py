@@ -0,0 +1,53 @@
+import asyncio
+import sys
+from typing import List
+
+import pymongo
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from tdd_project.core.config import settings
+from tdd_project.db.mongo import db_client
+from tdd_project.models.product import ProductModel
+
+
+async def backfill_name_lower(database: AsyncIOMotorDatabase) -> int:
+    # Products written before prefix search stored name_lower. Documents
+    # without a string name are left alone and stay out of prefix search.
+    collection = database[ProductModel.collection_name]
+    pending = {"name_lower": None, "name": {"$type": "string"}}
+    count = 0
+    while True:
+        documents = await (
+            collection.find(pending, {"name": 1})
+            .limit(settings.BULK_BATCH_SIZE)
+            .to_list(length=None)
+        )
+        if not documents:
+            return count
+        await collection.bulk_write(
+            [
+                pymongo.UpdateOne(
+                    {"_id": document["_id"]},
+                    {"$set": {"name_lower": document["name"].lower()}},
+                )
+                for document in documents
+            ],
+            ordered=False,
+        )
+        count += len(documents)
+
+
+async def main(argv: List[str]) -> int:
+    database = db_client.get().get_database()
+    count = await backfill_name_lower(database)
+    skipped = await database[ProductModel.collection_name].count_documents(
+        {"name_lower": None}
+    )
+    print(f"{ProductModel.collection_name}: backfilled name_lower on {count}")
+    if skipped:
+        print(f"{ProductModel.collection_name}: {skipped} without a string name")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
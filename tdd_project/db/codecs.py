@@ -0,0 +1,18 @@
+from decimal import Decimal
+
+from bson import Decimal128
+from bson.codec_options import TypeCodec, TypeRegistry
+
+
+class DecimalCodec(TypeCodec):
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> Decimal128:
+        return Decimal128(value)
+
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+
+type_registry = TypeRegistry([DecimalCodec()])
@@ -0,0 +1,80 @@
+import asyncio
+import sys
+from typing import List, Type
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from tdd_project.db.mongo import db_client
+from tdd_project.models.base import CreateBaseModel
+from tdd_project.models.idempotency import IdempotencyKeyModel
+from tdd_project.models.product import ProductModel
+
+registry: List[Type[CreateBaseModel]] = [ProductModel, IdempotencyKeyModel]
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> None:
+    for model in registry:
+        if model.indexes:
+            collection = database[model.collection_name]
+            await sync_ttls(collection, model.indexes)
+            # A no-op for indexes that already exist with the same spec; any
+            # other difference fails with IndexOptionsConflict.
+            await collection.create_indexes(model.indexes)
+
+
+async def sync_ttls(
+    collection: AsyncIOMotorCollection, indexes: List[IndexModel]
+) -> None:
+    # Retention settings change expireAfterSeconds, which collMod updates in
+    # place instead of create_indexes refusing the index.
+    existing = await collection.index_information()
+    for index in indexes:
+        name = index.document["name"]
+        ttl = index.document.get("expireAfterSeconds")
+        if ttl is None or name not in existing:
+            continue
+        if existing[name].get("expireAfterSeconds") != ttl:
+            await collection.database.command(
+                "collMod",
+                collection.name,
+                index={"name": name, "expireAfterSeconds": ttl},
+            )
+
+
+async def report(database: AsyncIOMotorDatabase) -> dict[str, dict[str, List[str]]]:
+    result = {}
+    for model in registry:
+        collection = database[model.collection_name]
+        declared = {index.document["name"] for index in model.indexes}
+        existing = set(await collection.index_information()) - {"_id_"}
+        stats = await collection.aggregate([{"$indexStats": {}}]).to_list(length=None)
+
+        result[model.collection_name] = {
+            "missing": sorted(declared - existing),
+            "undeclared": sorted(existing - declared),
+            "unused": sorted(
+                stat["name"]
+                for stat in stats
+                if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0
+            ),
+        }
+    return result
+
+
+async def main(argv: List[str]) -> int:
+    database = db_client.get().get_database()
+    if argv[:1] == ["ensure"]:
+        await ensure_indexes(database)
+
+    problems = 0
+    for collection, found in (await report(database)).items():
+        for kind, names in found.items():
+            for name in names:
+                problems += kind == "missing"
+                print(f"{collection}: {kind} index {name}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -1,13 +1,43 @@
+from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from tdd_project.core.config import settings
+from tdd_project.db.codecs import type_registry
+from tdd_project.db.monitoring import CommandMetrics, PoolMetrics
 
 
 class MongoClient:
     def __init__(self) -> None:
-        self.client: AsyncIOMotorClient = AsyncIOMotorClient(settings.DATABASE_URL)
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.pool_metrics = PoolMetrics()
+        self.command_metrics = CommandMetrics()
 
-    def get(self) -> AsyncIOMotorClient:
+    def options(self) -> dict[str, Any]:
+        options = {
+            "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+            "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "readPreference": settings.MONGO_READ_PREFERENCE,
+            "event_listeners": [self.pool_metrics, self.command_metrics],
+            "type_registry": type_registry,
+        }
+        if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+            options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+        if settings.MONGO_COMPRESSORS:
+            options["compressors"] = settings.MONGO_COMPRESSORS
+        return options
+
+    def connect(self) -> AsyncIOMotorClient:
+        if self.client is None:
+            self.client = AsyncIOMotorClient(settings.DATABASE_URL, **self.options())
         return self.client
 
+    def get(self) -> AsyncIOMotorClient:
+        return self.connect()
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
 
 db_client = MongoClient()
@@ -0,0 +1,129 @@
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+from pymongo import monitoring
+
+from tdd_project.core.config import settings
+from tdd_project.core.metrics import current_request, metrics
+
+logger = logging.getLogger("tdd_project.mongo")
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkins = 0
+        self.checkout_wait_seconds = 0.0
+        self.pool_clears = 0
+
+    @property
+    def in_use(self) -> int:
+        return self.checkouts - self.checkins
+
+    @property
+    def open(self) -> int:
+        return self.connections_created - self.connections_closed
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "connections_open": self.open,
+                "connections_in_use": self.in_use,
+                "connections_created": self.connections_created,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_seconds": self.checkout_wait_seconds,
+                "pool_clears": self.pool_clears,
+            }
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+            self.checkout_wait_seconds += getattr(event, "duration", 0.0)
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_seconds += getattr(event, "duration", 0.0)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.checkins += 1
+
+
+class CommandMetrics(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[Any, int], Any] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        # Keep the command only until it finishes, for the slow query log.
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event: Any, failed: bool) -> None:
+        with self._lock:
+            command = self._started.pop((event.connection_id, event.request_id), None)
+
+        seconds = event.duration_micros / 1_000_000
+        metrics.observe_command(event.command_name, seconds, failed)
+
+        # Motor copies the caller's context into its executor, so this is the
+        # request that issued the command.
+        timings = current_request.get()
+        if timings is not None:
+            timings.db_seconds += seconds
+            timings.db_commands += 1
+
+        if seconds * 1000 >= settings.MONGO_SLOW_QUERY_MS:
+            logger.warning(
+                "Slow Mongo command %s took %.1fms for %s: %.500s",
+                event.command_name,
+                seconds * 1000,
+                timings.describe() if timings is not None else "-",
+                command,
+            )
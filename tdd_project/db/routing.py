@@ -0,0 +1,77 @@
+import base64
+import binascii
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Optional
+
+import bson
+from bson.errors import BSONError
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
+
+from tdd_project.core.config import settings
+from tdd_project.core.exceptions import InvalidQueryException
+
+MODES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+current_session: ContextVar[Optional[AsyncIOMotorClientSession]] = ContextVar(
+    "current_session", default=None
+)
+read_override: ContextVar[Optional[str]] = ContextVar("read_override", default=None)
+
+
+@lru_cache(maxsize=None)
+def read_preference(mode: str) -> _ServerMode:
+    if mode == "primary":
+        return Primary()
+    if mode not in MODES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    return MODES[mode](max_staleness=settings.MONGO_MAX_STALENESS_SECONDS)
+
+
+def read_mode(operation: str) -> str:
+    return read_override.get() or settings.MONGO_READ_ROUTES.get(
+        operation, settings.MONGO_READ_PREFERENCE
+    )
+
+
+def read_from(mode: str) -> Callable[[], None]:
+    read_preference(mode)
+
+    # Route dependency: Depends(read_from("primary")) pins that route's reads.
+    async def dependency() -> None:
+        read_override.set(mode)
+
+    return dependency
+
+
+def encode_causal_token(session: AsyncIOMotorClientSession) -> Optional[str]:
+    if session.operation_time is None:
+        return None
+    raw = bson.encode(
+        {"operationTime": session.operation_time, "clusterTime": session.cluster_time}
+    )
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def apply_causal_token(session: AsyncIOMotorClientSession, token: str) -> None:
+    try:
+        document = bson.decode(base64.urlsafe_b64decode(token.encode()))
+        # Standalone servers have no cluster time to gossip.
+        if document.get("clusterTime") is not None:
+            session.advance_cluster_time(document["clusterTime"])
+        session.advance_operation_time(document["operationTime"])
+    except (binascii.Error, BSONError, KeyError, TypeError, ValueError):
+        raise InvalidQueryException(message=f"Invalid causal token: {token}")
@@ -1,7 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from tdd_project.core.config import settings
+from tdd_project.core.http import PydanticJSONResponse
+from tdd_project.core.middleware import (
+    CompressionMiddleware,
+    ConcurrencyLimitMiddleware,
+    TimingMiddleware,
+)
+from tdd_project.db.indexes import ensure_indexes
+from tdd_project.db.mongo import db_client
 from tdd_project.routers import api_router
+from tdd_project.usecases.events import product_feed
+from tdd_project.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    client = db_client.connect()
+    await ensure_indexes(client.get_database())
+    if settings.EVENTS_ENABLED:
+        product_feed.start()
+    # Runs in the background so /health/live answers while the worker warms up.
+    warming = asyncio.create_task(warmup(app))
+    yield
+    warming.cancel()
+    await product_feed.stop()
+    db_client.close()
 
 
 class App(FastAPI):
@@ -11,11 +39,26 @@ class App(FastAPI):
             **kwargs,
             version="0.0.1",
             title=settings.PROJECT_NAME,
+            lifespan=lifespan,
+            default_response_class=PydanticJSONResponse,
             # root_path=settings.ROOT_PATH
         )
 
 
 app = App()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+app.add_middleware(
+    ConcurrencyLimitMiddleware,
+    max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+    max_queued=settings.MAX_QUEUED_REQUESTS,
+    queue_timeout=settings.QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.RETRY_AFTER_SECONDS,
+)
+app.add_middleware(TimingMiddleware)
 app.include_router(api_router)
 
 
@@ -1,22 +1,16 @@
 from datetime import datetime, timezone
-from decimal import Decimal
-from typing import Any
+from typing import ClassVar, List, Optional
 import uuid
-from bson import Decimal128
-from pydantic import UUID4, BaseModel, Field, model_serializer
+from pydantic import UUID4, BaseModel, Field
+from pymongo import IndexModel
 
 
 class CreateBaseModel(BaseModel):
+    collection_name: ClassVar[str]
+    indexes: ClassVar[List[IndexModel]] = []
+
     id: UUID4 = Field(default_factory=uuid.uuid4)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-    @model_serializer
-    def set_model(self) -> dict[str, Any]:
-        self_dict = dict(self)
-
-        for key, value in self_dict.items():
-            if isinstance(value, Decimal):
-                self_dict[key] = Decimal128(str(value))
-
-        return self_dict
+    version: int = Field(default=1)
+    deleted_at: Optional[datetime] = Field(default=None)
@@ -0,0 +1,30 @@
+from typing import ClassVar, Dict, List, Optional
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from tdd_project.core.config import settings
+from tdd_project.models.base import CreateBaseModel
+
+
+class IdempotencyKeyModel(CreateBaseModel):
+    collection_name: ClassVar[str] = "idempotency_keys"
+    indexes: ClassVar[List[IndexModel]] = [
+        # Concurrent retries race on this index instead of on a lock.
+        IndexModel(
+            [("scope", ASCENDING), ("key", ASCENDING)],
+            name="scope_key_unique",
+            unique=True,
+        ),
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        ),
+    ]
+
+    scope: str = Field(..., description="Method and route the key was used on")
+    key: str = Field(..., description="Client supplied Idempotency-Key")
+    fingerprint: str = Field(..., description="Hash of the request body")
+    completed: bool = Field(False, description="False while the request runs")
+    status_code: Optional[int] = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[bytes] = None
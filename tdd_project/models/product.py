@@ -1,6 +1,45 @@
+from typing import ClassVar, List
+from pydantic import computed_field
+from pymongo import ASCENDING, TEXT, IndexModel
+from tdd_project.core.config import settings
 from tdd_project.models.base import CreateBaseModel
 from tdd_project.schemas.product import ProductIn
 
+ACTIVE = {"deleted_at": None}
+
 
 class ProductModel(ProductIn, CreateBaseModel):
-    pass
+    collection_name: ClassVar[str] = "products"
+    # Reads hide soft-deleted products, so the query indexes only cover the
+    # active ones. Matching {"deleted_at": None} also covers legacy documents.
+    indexes: ClassVar[List[IndexModel]] = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("price", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)],
+            name="price_status_created_at_active",
+            partialFilterExpression=ACTIVE,
+        ),
+        IndexModel(
+            [("quantity", ASCENDING), ("status", ASCENDING)],
+            name="quantity_status_active",
+            partialFilterExpression=ACTIVE,
+        ),
+        IndexModel(
+            [("created_at", ASCENDING), ("id", ASCENDING)],
+            name="created_at_id_active",
+            partialFilterExpression=ACTIVE,
+        ),
+        IndexModel([("name", TEXT)], name="name_text"),
+        IndexModel([("name_lower", ASCENDING)], name="name_lower"),
+        IndexModel(
+            [("deleted_at", ASCENDING)],
+            name="deleted_at_ttl",
+            expireAfterSeconds=settings.SOFT_DELETE_RETENTION_SECONDS,
+        ),
+    ]
+
+    # Prefix search matches this with index bounds, whatever the casing of q.
+    @computed_field
+    @property
+    def name_lower(self) -> str:
+        return self.name.lower()
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from tdd_project.controllers.health import router as health
+from tdd_project.controllers.metrics import router as metrics
 from tdd_project.controllers.product import router as product
 
 api_router = APIRouter()
 api_router.include_router(product, prefix="/products")
+api_router.include_router(metrics)
+api_router.include_router(health, prefix="/health")
@@ -1,7 +1,5 @@
 from datetime import datetime
-from decimal import Decimal
-from bson import Decimal128
-from pydantic import UUID4, BaseModel, Field, model_validator
+from pydantic import UUID4, BaseModel, Field
 
 
 class BaseSchemaMixin(BaseModel):
@@ -13,11 +11,5 @@ class OutSchema(BaseModel):
     id: UUID4 = Field()
     created_at: datetime = Field()
     updated_at: datetime = Field()
-
-    @model_validator(mode="before")
-    def set_schema(cls, data):
-        for key, value in data.items():
-            if isinstance(value, Decimal128):
-                data[key] = Decimal(str(value))
-
-        return data
+    # Documents written before versioning have no field; they count as version 0.
+    version: int = Field(0, exclude=True)
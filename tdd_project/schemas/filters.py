@@ -0,0 +1,47 @@
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+from pydantic import Field
+
+from tdd_project.core.exceptions import InvalidQueryException
+from tdd_project.schemas.base import BaseSchemaMixin
+
+
+class ProductFilter(BaseSchemaMixin):
+    min_price: Optional[Decimal] = Field(None, description="Lower price bound")
+    max_price: Optional[Decimal] = Field(None, description="Upper price bound")
+    min_quantity: Optional[int] = Field(None, description="Lower quantity bound")
+    max_quantity: Optional[int] = Field(None, description="Upper quantity bound")
+    status: Optional[bool] = Field(None, description="Product status")
+    inclusive: bool = Field(False, description="Include the range bounds")
+
+    def compile(self) -> dict[str, Any]:
+        # Keys follow the compound indexes declared on ProductModel.
+        filters: dict[str, Any] = {}
+        price = self._range("price", self.min_price, self.max_price)
+        if price:
+            filters["price"] = price
+        quantity = self._range("quantity", self.min_quantity, self.max_quantity)
+        if quantity:
+            filters["quantity"] = quantity
+        if self.status is not None:
+            filters["status"] = self.status
+        return filters
+
+    def _range(
+        self,
+        name: str,
+        lower: Optional[Union[Decimal, int]],
+        upper: Optional[Union[Decimal, int]],
+    ) -> dict[str, Any]:
+        if lower is not None and upper is not None and lower > upper:
+            raise InvalidQueryException(
+                message=f"Invalid {name} range: {lower} > {upper}"
+            )
+
+        bounds = {}
+        if lower is not None:
+            bounds["$gte" if self.inclusive else "$gt"] = lower
+        if upper is not None:
+            bounds["$lte" if self.inclusive else "$lt"] = upper
+        return bounds
@@ -1,7 +1,17 @@
+from datetime import datetime
 from decimal import Decimal
-from typing import Annotated, Optional
-from bson import Decimal128
-from pydantic import AfterValidator, Field, model_validator
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple, Type
+from pydantic import (
+    UUID4,
+    BaseModel,
+    Field,
+    SerializeAsAny,
+    create_model,
+    model_validator,
+)
+from tdd_project.core.config import settings
+from tdd_project.core.exceptions import InvalidQueryException
 from tdd_project.schemas.base import BaseSchemaMixin, OutSchema
 
 
@@ -16,20 +26,58 @@ class ProductIn(ProductBase):
     ...
 
 
+class ProductBulkIn(ProductIn):
+    id: Optional[UUID4] = Field(None, description="Product id, generated if omitted")
+
+
 class ProductOut(ProductIn, OutSchema):
     ...
 
 
-def convert_decimal_128(v):
-    return Decimal128(str(v))
+class ProductArchivedOut(ProductOut):
+    deleted_at: Optional[datetime] = Field(None, description="Set once deleted")
+
+
+PRODUCT_FIELDS = tuple(
+    name for name, field in ProductOut.model_fields.items() if not field.exclude
+)
+
 
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if not fields:
+        return None
 
-Decimal_ = Annotated[Decimal, AfterValidator(convert_decimal_128)]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(PRODUCT_FIELDS)
+    if unknown:
+        raise InvalidQueryException(
+            message=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    # Canonical order keeps the model cache keyed by field set, not by spelling.
+    return tuple(name for name in PRODUCT_FIELDS if name in requested or name == "id")
+
+
+@lru_cache(maxsize=128)
+def product_fields_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    definitions = {
+        name: (field.annotation, field)
+        for name, field in ProductOut.model_fields.items()
+        if name in fields
+    }
+    # Cursors and validators (ETag, Last-Modified) need these even when they
+    # are not part of the returned fields.
+    definitions.setdefault("created_at", (datetime, Field(exclude=True)))
+    definitions.setdefault("updated_at", (datetime, Field(exclude=True)))
+    definitions["version"] = (int, Field(0, exclude=True))
+    return create_model(
+        f"ProductOut[{','.join(fields)}]", __base__=BaseSchemaMixin, **definitions
+    )
 
 
 class ProductUpdate(BaseSchemaMixin):
     quantity: Optional[int] = Field(None, description="Product quantity")
-    price: Optional[Decimal_] = Field(None, description="Product price")
+    price: Optional[Decimal] = Field(None, description="Product price")
     status: Optional[bool] = Field(None, description="Product status")
 
     @model_validator(mode="before")
@@ -39,3 +87,97 @@ class ProductUpdate(BaseSchemaMixin):
 
 class ProductUpdateOut(ProductOut):
     ...
+
+
+class ProductBulkUpdate(ProductUpdate):
+    id: UUID4 = Field(..., description="Product id")
+
+
+class ProductBulkDelete(BaseSchemaMixin):
+    ids: List[UUID4] = Field(
+        ..., max_length=settings.BULK_MAX_ITEMS, description="Product ids"
+    )
+
+
+class ProductLookup(BaseSchemaMixin):
+    ids: List[UUID4] = Field(
+        ..., min_length=1, max_length=settings.LOOKUP_MAX_IDS, description="Product ids"
+    )
+
+
+class ProductLookupItem(BaseSchemaMixin):
+    id: UUID4 = Field(..., description="Requested product id")
+    found: bool = Field(..., description="False for unknown or deleted products")
+    # Sparse lookups carry a ProductOut[...] model, so serialize what is there.
+    product: Optional[SerializeAsAny[BaseModel]] = None
+
+
+class StockAdjustment(BaseSchemaMixin):
+    delta: int = Field(..., description="Units to add (positive) or remove (negative)")
+
+    @model_validator(mode="after")
+    def check_delta(self) -> "StockAdjustment":
+        if self.delta == 0:
+            raise ValueError("delta must not be zero")
+        return self
+
+
+class ProductBulkStock(StockAdjustment):
+    id: UUID4 = Field(..., description="Product id")
+
+
+class BulkItemResult(BaseSchemaMixin):
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[UUID4] = Field(None, description="Product id")
+    status: Literal[
+        "created",
+        "updated",
+        "adjusted",
+        "deleted",
+        "not_found",
+        "insufficient_stock",
+        "error",
+    ]
+    detail: Optional[str] = Field(None, description="Error message")
+
+
+class BulkResult(BaseSchemaMixin):
+    succeeded: int = Field(..., description="Items applied")
+    failed: int = Field(..., description="Items rejected")
+    items: List[BulkItemResult]
+
+    @classmethod
+    def from_items(cls, items: List[BulkItemResult]) -> "BulkResult":
+        failed = sum(
+            item.status in ("not_found", "insufficient_stock", "error")
+            for item in items
+        )
+        return cls(succeeded=len(items) - failed, failed=failed, items=items)
+
+
+class StatusStats(BaseSchemaMixin):
+    status: bool = Field(..., description="Product status")
+    count: int = Field(..., description="Products with this status")
+    quantity: int = Field(..., description="Units in stock with this status")
+
+
+class PriceBucket(BaseSchemaMixin):
+    min: Optional[Decimal] = Field(None, description="Inclusive lower bound")
+    max: Optional[Decimal] = Field(None, description="Upper bound")
+    count: int = Field(..., description="Products in the bucket")
+
+
+class ProductStats(BaseSchemaMixin):
+    count: int = Field(..., description="Number of products")
+    total_quantity: int = Field(..., description="Units in stock")
+    stock_value: Decimal = Field(..., description="Sum of price * quantity")
+    by_status: List[StatusStats]
+    price_histogram: List[PriceBucket]
+
+
+class ProductEvent(BaseSchemaMixin):
+    operation: Literal["insert", "update", "replace", "delete"]
+    id: Optional[UUID4] = Field(
+        None, description="Unknown for deletes without pre-images"
+    )
+    product: Optional[ProductOut] = Field(None, description="State after the change")
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from functools import cached_property
+from typing import Any, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from tdd_project.core.cache import Cache
+from tdd_project.core.config import settings
+from tdd_project.core.events import Event, EventBroker
+from tdd_project.db.mongo import db_client
+from tdd_project.models.product import ProductModel
+from tdd_project.schemas.product import ProductEvent, ProductOut
+from tdd_project.usecases.product import product_cache
+
+logger = logging.getLogger("tdd_project.events")
+
+RESUME_TOKENS = "resume_tokens"
+# The server cannot resume from the stored token any more.
+RESUME_FAILED = {260, 280, 286}
+# $changeStream is only supported on replica sets and sharded clusters.
+UNSUPPORTED = {40573}
+INVALIDATING = {"drop", "rename", "dropDatabase", "invalidate"}
+
+
+class ProductChangeFeed:
+    def __init__(self, cache: Cache, broker: EventBroker) -> None:
+        self.cache = cache
+        self.broker = broker
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        self.resume_token: Optional[Mapping[str, Any]] = None
+        self.saved_token: Optional[Mapping[str, Any]] = None
+
+    @cached_property
+    def database(self) -> AsyncIOMotorDatabase:
+        return db_client.get().get_database()
+
+    @cached_property
+    def collection(self) -> AsyncIOMotorCollection:
+        return self.database.get_collection(ProductModel.collection_name)
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        self.broker.close_all()
+
+    async def run(self) -> None:
+        try:
+            if settings.EVENTS_PRE_IMAGES:
+                await self.enable_pre_images()
+            self.resume_token = await self.load_token()
+        except PyMongoError as exc:
+            logger.warning("Cannot prepare product change stream: %s", exc)
+
+        try:
+            while True:
+                try:
+                    await self.watch()
+                except OperationFailure as exc:
+                    if exc.code in UNSUPPORTED:
+                        logger.warning("Change streams unavailable: %s", exc)
+                        return
+                    logger.warning("Product change stream failed: %s", exc)
+                    if exc.code in RESUME_FAILED:
+                        self.reset()
+                except PyMongoError as exc:
+                    logger.warning("Product change stream failed: %s", exc)
+                except Exception:
+                    logger.exception("Product change stream failed")
+                finally:
+                    self.running = False
+                await asyncio.sleep(settings.EVENTS_RETRY_SECONDS)
+        finally:
+            with suppress(PyMongoError):
+                await asyncio.shield(self.save_token())
+
+    async def watch(self) -> None:
+        options = {"full_document": "updateLookup", "resume_after": self.resume_token}
+        if settings.EVENTS_PRE_IMAGES:
+            options["full_document_before_change"] = "whenAvailable"
+
+        async with self.collection.watch(**options) as stream:
+            self.running = True
+            saved_at = time.monotonic()
+            async for change in stream:
+                self.consume(change)
+                if change["operationType"] == "invalidate":
+                    self.reset()
+                    return
+
+                self.resume_token = stream.resume_token
+                if time.monotonic() - saved_at >= settings.EVENTS_TOKEN_SAVE_SECONDS:
+                    await self.save_token()
+                    saved_at = time.monotonic()
+
+    def consume(self, change: Mapping[str, Any]) -> Optional[ProductEvent]:
+        try:
+            return self.apply(change)
+        except (KeyError, TypeError, ValueError):
+            # One unreadable document must not stop the feed. What it changed
+            # is unknown, so the cache forgets it rather than go stale.
+            logger.exception("Skipping product change %s", change.get("_id"))
+            document = change.get("fullDocument") or {}
+            before = change.get("fullDocumentBeforeChange") or {}
+            id = document.get("id") or before.get("id")
+            if id is None:
+                self.cache.clear()
+            else:
+                self.cache.delete(id)
+            return None
+
+    def apply(self, change: Mapping[str, Any]) -> Optional[ProductEvent]:
+        operation = change["operationType"]
+        if operation in INVALIDATING:
+            self.cache.clear()
+            return None
+
+        document = change.get("fullDocument")
+        before = change.get("fullDocumentBeforeChange")
+        product = ProductOut(**document) if document else None
+        id = product.id if product else before["id"] if before else None
+        if document and document.get("deleted_at") is not None:
+            # Soft deletes arrive as updates; readers see them as deletes.
+            operation, product = "delete", None
+
+        if id is None:
+            # Without a pre-image a delete only carries the ObjectId, so there
+            # is no telling which cached product it was.
+            self.cache.clear()
+        elif product is None:
+            self.cache.delete(id)
+        elif id in self.cache:
+            # Refresh what is already cached, but don't let writes evict reads.
+            self.cache.set(id, product)
+
+        event = ProductEvent(operation=operation, id=id, product=product)
+        self.broker.publish(
+            Event(
+                id=change["_id"]["_data"],
+                name=operation,
+                data=event.model_dump_json(),
+            )
+        )
+        return event
+
+    async def enable_pre_images(self) -> None:
+        try:
+            await self.database.command(
+                "collMod",
+                ProductModel.collection_name,
+                changeStreamPreAndPostImages={"enabled": True},
+            )
+        except PyMongoError as exc:
+            logger.warning("Change stream pre-images unavailable: %s", exc)
+
+    async def load_token(self) -> Optional[Mapping[str, Any]]:
+        document = await self.database[RESUME_TOKENS].find_one(
+            {"_id": ProductModel.collection_name}
+        )
+        self.saved_token = document["token"] if document else None
+        return self.saved_token
+
+    async def save_token(self) -> None:
+        if self.resume_token is None or self.resume_token == self.saved_token:
+            return
+        await self.database[RESUME_TOKENS].update_one(
+            {"_id": ProductModel.collection_name},
+            {"$set": {"token": self.resume_token}},
+            upsert=True,
+        )
+        self.saved_token = self.resume_token
+
+    def reset(self) -> None:
+        # Whatever happened since the lost token is unknown to the cache. The
+        # stored token is overwritten by the first token of the new stream.
+        self.cache.clear()
+        self.resume_token = None
+
+
+product_events = EventBroker(
+    queue_size=settings.EVENTS_QUEUE_SIZE, history_size=settings.EVENTS_HISTORY_SIZE
+)
+product_feed = ProductChangeFeed(cache=product_cache, broker=product_events)
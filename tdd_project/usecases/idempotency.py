@@ -0,0 +1,123 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Response
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic_core import to_json
+from pymongo.errors import DuplicateKeyError
+
+from tdd_project.core.config import settings
+from tdd_project.core.exceptions import (
+    ConflictException,
+    IdempotencyKeyReusedException,
+)
+from tdd_project.db.mongo import db_client
+from tdd_project.models.idempotency import IdempotencyKeyModel
+
+REPLAYED_HEADERS = ("content-type", "etag")
+
+
+def fingerprint(body: Any) -> str:
+    return hashlib.sha256(to_json(body)).hexdigest()
+
+
+class IdempotencyUsecase:
+    @cached_property
+    def collection(self) -> AsyncIOMotorCollection:
+        return db_client.get().get_database()[IdempotencyKeyModel.collection_name]
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        body: Any,
+        handler: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        if key is None:
+            return await handler()
+
+        record = IdempotencyKeyModel(
+            scope=scope, key=key, fingerprint=fingerprint(body)
+        )
+        replay = await self.acquire(record)
+        if replay is not None:
+            return replay
+
+        try:
+            response = await handler()
+        except Exception:
+            await self.release(record)
+            raise
+
+        if response.status_code >= 500:
+            await self.release(record)
+        else:
+            await self.complete(record, response)
+        return response
+
+    async def acquire(self, record: IdempotencyKeyModel) -> Optional[Response]:
+        try:
+            await self.collection.insert_one(record.model_dump())
+            return None
+        except DuplicateKeyError:
+            pass
+
+        existing = await self.collection.find_one(
+            {"scope": record.scope, "key": record.key}
+        )
+        if existing is None:
+            # Expired between the insert and the lookup.
+            return await self.acquire(record)
+        if existing["fingerprint"] != record.fingerprint:
+            raise IdempotencyKeyReusedException()
+        if existing["completed"]:
+            headers = {**existing["headers"], "Idempotent-Replayed": "true"}
+            return Response(
+                content=existing["body"],
+                status_code=existing["status_code"],
+                headers=headers,
+            )
+
+        stale = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.IDEMPOTENCY_LOCK_SECONDS
+        )
+        taken = await self.collection.update_one(
+            {"id": existing["id"], "completed": False, "created_at": {"$lt": stale}},
+            {"$set": {"id": record.id, "created_at": record.created_at}},
+        )
+        if taken.modified_count == 0:
+            raise ConflictException(
+                message=f"Request with Idempotency-Key {record.key} is in progress"
+            )
+        return None
+
+    async def complete(self, record: IdempotencyKeyModel, response: Response) -> None:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name in REPLAYED_HEADERS
+        }
+        await self.collection.update_one(
+            {"id": record.id},
+            {
+                "$set": {
+                    "completed": True,
+                    "status_code": response.status_code,
+                    "headers": headers,
+                    "body": response.body,
+                    "updated_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+
+    async def release(self, record: IdempotencyKeyModel) -> None:
+        await self.collection.delete_one({"id": record.id, "completed": False})
+
+
+idempotency_usecase = IdempotencyUsecase()
+
+
+async def get_idempotency_usecase() -> IdempotencyUsecase:
+    return idempotency_usecase
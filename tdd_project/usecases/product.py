@@ -1,68 +1,589 @@
 from datetime import datetime, timezone
+from decimal import Decimal
+import asyncio
+import json
+import re
 from uuid import UUID
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from functools import cached_property, wraps
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorCursor,
+    AsyncIOMotorDatabase,
+)
 import pymongo
-from pymongo.errors import DuplicateKeyError, PyMongoError
+from pymongo.read_concern import ReadConcern
+from pymongo.errors import (
+    BulkWriteError,
+    DuplicateKeyError,
+    ExecutionTimeout,
+    PyMongoError,
+)
+from tdd_project.core.cache import MISSING, NOT_FOUND, Cache, LRUCache
+from tdd_project.core.config import settings
+from tdd_project.core.singleflight import SingleFlight
 from tdd_project.db.mongo import db_client
+from tdd_project.db.routing import current_session, read_mode, read_preference
 from tdd_project.schemas.product import (
+    BulkItemResult,
+    ProductArchivedOut,
+    ProductBulkIn,
+    ProductBulkStock,
+    ProductBulkUpdate,
     ProductIn,
+    ProductLookupItem,
     ProductOut,
     ProductUpdate,
+    PriceBucket,
+    ProductStats,
     ProductUpdateOut,
+    StatusStats,
+    product_fields_model,
+)
+from typing import (
+    AsyncIterator,
+    Iterator,
+    List,
+    Any,
+    Awaitable,
+    Callable,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from pydantic import BaseModel
+from tdd_project.core.exceptions import (
+    InsertionErrorException,
+    InsufficientStockException,
+    InvalidQueryException,
+    NotFoundException,
+    PreconditionFailedException,
+    QueryTimeoutException,
+)
+from tdd_project.core.pagination import SORT_KEY, after_filter
+from tdd_project.models.product import ACTIVE, ProductModel
+
+T = TypeVar("T")
+
+
+def batched(items: Sequence[T], size: int) -> Iterator[tuple[int, Sequence[T]]]:
+    for start in range(0, len(items), size):
+        yield start, items[start : start + size]
+
+
+def projection(fields: Optional[Tuple[str, ...]]) -> Optional[dict[str, int]]:
+    if not fields:
+        return None
+    hidden = {"_id": 0, "created_at": 1, "updated_at": 1, "version": 1}
+    return {**hidden, **{name: 1 for name in fields}}
+
+
+def visible(filters: Optional[dict], include_deleted: bool = False) -> dict:
+    if include_deleted:
+        return filters or {}
+    return {**(filters or {}), **ACTIVE}
+
+
+def flight_key(value: Any) -> str:
+    # Equal filters must share a key however their Decimals were written.
+    return json.dumps(
+        value,
+        sort_keys=True,
+        default=lambda v: str(v.normalize()) if isinstance(v, Decimal) else str(v),
+    )
+
+
+def max_time(operation: str) -> Optional[int]:
+    return settings.QUERY_MAX_TIME_MS.get(operation)
+
+
+def time_limited(operation: str) -> Callable:
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await method(*args, **kwargs)
+            except ExecutionTimeout:
+                raise QueryTimeoutException(
+                    message=f"Product {operation} exceeded {max_time(operation)}ms"
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def insertion_error(code: Optional[int], detail: str) -> InsertionErrorException:
+    if code == 11000:
+        return InsertionErrorException(
+            message="A product with the same ID already exists."
+        )
+    return InsertionErrorException(message=f"Error inserting product: {detail}")
+
+
+product_cache = LRUCache(
+    maxsize=settings.PRODUCT_CACHE_SIZE, ttl=settings.PRODUCT_CACHE_TTL
 )
-from typing import List, Optional
-from tdd_project.core.exceptions import InsertionErrorException, NotFoundException
-from tdd_project.models.product import ProductModel
+product_flight = SingleFlight()
 
 
 class ProductUsecase:
     def __init__(self) -> None:
-        self.client: AsyncIOMotorClient = db_client.get()
-        self.database: AsyncIOMotorDatabase = self.client.get_database()
-        self.collection = self.database.get_collection("products")
+        self.cache: Cache = product_cache
+        self.flight = product_flight
+        self._readers: dict[str, AsyncIOMotorCollection] = {}
+
+    # Resolved on first use so the client is created by the app lifespan, not at import.
+    @cached_property
+    def client(self) -> AsyncIOMotorClient:
+        return db_client.get()
+
+    @cached_property
+    def database(self) -> AsyncIOMotorDatabase:
+        return self.client.get_database()
+
+    @cached_property
+    def collection(self) -> AsyncIOMotorCollection:
+        return self.database.get_collection(ProductModel.collection_name)
+
+    def _reader(self, operation: str) -> AsyncIOMotorCollection:
+        mode = read_mode(operation)
+        if mode not in self._readers:
+            options = {"read_preference": read_preference(mode)}
+            if mode != "primary":
+                # Only majority-committed data, so a failover cannot roll back
+                # what a secondary already served.
+                options["read_concern"] = ReadConcern("majority")
+            self._readers[mode] = self.collection.with_options(**options)
+        return self._readers[mode]
 
     async def create(self, body: ProductIn) -> ProductOut:
         product_model = ProductModel(**body.model_dump())
         try:
-            await self.collection.insert_one(product_model.model_dump())
-        except DuplicateKeyError:
-            raise InsertionErrorException(
-                message="A product with the same ID already exists."
+            await self.collection.insert_one(
+                product_model.model_dump(), session=current_session.get()
             )
+        except DuplicateKeyError as exc:
+            raise insertion_error(exc.code, str(exc))
         except PyMongoError as exc:
-            raise InsertionErrorException(message=f"Error inserting product: {exc}")
+            raise insertion_error(None, str(exc))
+
+        self._invalidate(product_model.id)
+        # The model was validated on the way in; no need to validate it again.
+        return ProductOut.model_construct(**dict(product_model))
+
+    async def create_many(self, bodies: List[ProductBulkIn]) -> List[BulkItemResult]:
+        models = [ProductModel(**body.model_dump(exclude_none=True)) for body in bodies]
+        results = [
+            BulkItemResult(index=index, id=model.id, status="created")
+            for index, model in enumerate(models)
+        ]
+
+        for start, batch in batched(models, settings.BULK_BATCH_SIZE):
+            try:
+                await self.collection.insert_many(
+                    [model.model_dump() for model in batch],
+                    ordered=False,
+                    session=current_session.get(),
+                )
+            except BulkWriteError as exc:
+                for error in exc.details["writeErrors"]:
+                    result = results[start + error["index"]]
+                    result.status = "error"
+                    result.detail = insertion_error(
+                        error.get("code"), error.get("errmsg")
+                    ).message
+            except PyMongoError as exc:
+                for result in results[start : start + len(batch)]:
+                    result.status = "error"
+                    result.detail = insertion_error(None, str(exc)).message
+
+        for result in results:
+            self._invalidate(result.id)
+        return results
+
+    @time_limited("get")
+    async def get(
+        self,
+        id: UUID,
+        fields: Optional[Tuple[str, ...]] = None,
+        include_deleted: bool = False,
+    ) -> Optional[ProductOut]:
+        if include_deleted:
+            # The cache only holds active products.
+            return await self._get_archived(id, fields)
+
+        if current_session.get() is not None:
+            # Causal reads must observe the token, which the cache cannot.
+            product = await self._load(id, fields, cache=False)
+        else:
+            product = self.cache.get(id)
+        if product is MISSING:
+            product = await self._coalesce(
+                ("get", id, fields), lambda: self._load(id, fields)
+            )
 
-        return ProductOut(**product_model.model_dump())
+        if product is NOT_FOUND:
+            raise NotFoundException(message=f"Product not found with filter: {id}")
 
-    async def get(self, id: UUID) -> Optional[ProductOut]:
-        result = await self.collection.find_one({"id": id})
+        if fields and isinstance(product, ProductOut):
+            return self._sparse(product, fields)
+        return product
 
+    async def _load(
+        self, id: UUID, fields: Optional[Tuple[str, ...]], cache: bool = True
+    ) -> Any:
+        since = self.cache.generation
+        result = await self._reader("get").find_one(
+            visible({"id": id}),
+            projection(fields),
+            max_time_ms=max_time("get"),
+            session=current_session.get(),
+        )
+        if not result:
+            if cache:
+                self.cache.set(
+                    id,
+                    NOT_FOUND,
+                    ttl=settings.PRODUCT_CACHE_NEGATIVE_TTL,
+                    since=since,
+                )
+            return NOT_FOUND
+        if fields:
+            return product_fields_model(fields)(**result)
+
+        product = ProductOut(**result)
+        if cache:
+            self.cache.set(id, product, since=since)
+        return product
+
+    async def _coalesce(self, key: tuple, fn: Callable[[], Awaitable[T]]) -> T:
+        # Session-bound reads cannot be shared with other requests.
+        if not settings.SINGLE_FLIGHT or current_session.get() is not None:
+            return await fn()
+        return await self.flight.do(key, fn)
+
+    def _invalidate(self, id: UUID) -> None:
+        self.cache.delete(id)
+        self.flight.forget(lambda key: key[0] == "get" and key[1] == id)
+
+    @time_limited("lookup")
+    async def lookup(
+        self, ids: Sequence[UUID], fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductLookupItem]:
+        found = {}
+        session = current_session.get()
+        for id in ids if session is None else ():
+            product = self.cache.get(id)
+            if product is not MISSING:
+                found[id] = product
+
+        missing = list(dict.fromkeys(id for id in ids if id not in found))
+        if missing:
+            since = self.cache.generation
+            # Sparse lookups project in Mongo but are not cached, like get().
+            cursor = self._reader("lookup").find(
+                visible({"id": {"$in": missing}}),
+                projection(fields),
+                max_time_ms=max_time("lookup"),
+                session=session,
+            )
+            model = product_fields_model(fields) if fields else ProductOut
+            async for result in cursor:
+                product = model(**result)
+                found[product.id] = product
+                if not fields:
+                    self.cache.set(product.id, product, since=since)
+            for id in missing:
+                if id not in found:
+                    found[id] = NOT_FOUND
+                    self.cache.set(
+                        id,
+                        NOT_FOUND,
+                        ttl=settings.PRODUCT_CACHE_NEGATIVE_TTL,
+                        since=since,
+                    )
+
+        items = []
+        for id in ids:
+            product = found[id]
+            if product is NOT_FOUND:
+                items.append(ProductLookupItem(id=id, found=False))
+                continue
+            if fields and isinstance(product, ProductOut):
+                product = self._sparse(product, fields)
+            items.append(ProductLookupItem(id=id, found=True, product=product))
+        return items
+
+    @staticmethod
+    def _sparse(product: ProductOut, fields: Tuple[str, ...]) -> BaseModel:
+        model = product_fields_model(fields)
+        return model.model_construct(
+            **{name: getattr(product, name) for name in model.model_fields}
+        )
+
+    async def _get_archived(
+        self, id: UUID, fields: Optional[Tuple[str, ...]]
+    ) -> BaseModel:
+        result = await self._reader("get").find_one(
+            {"id": id},
+            projection(fields),
+            max_time_ms=max_time("get"),
+            session=current_session.get(),
+        )
         if not result:
             raise NotFoundException(message=f"Product not found with filter: {id}")
+        if fields:
+            return product_fields_model(fields)(**result)
+        return ProductArchivedOut(**result)
 
-        return ProductOut(**result)
+    async def preload(self, limit: int) -> int:
+        if limit <= 0:
+            return 0
+        # Newest first, walking created_at_id_active backwards.
+        cursor = (
+            self.collection.find(visible(None))
+            .sort([("created_at", -1), ("id", -1)])
+            .limit(limit)
+        )
+        count = 0
+        since = self.cache.generation
+        async for result in cursor:
+            product = ProductOut(**result)
+            self.cache.set(product.id, product, since=since)
+            count += 1
+        return count
 
     # async def query(self) -> List[ProductOut]:
     #     return [ProductOut(**item) async for item in self.collection.find()]
-    async def query(self, filters: dict = None) -> List[ProductOut]:
-        cursor = self.collection.find(filters)
+    @time_limited("query")
+    async def query(
+        self,
+        filters: dict = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        include_deleted: bool = False,
+    ) -> List[ProductOut]:
+        # Callers share the returned list, so it must not be mutated.
+        key = ("query", flight_key(filters), limit, after, fields, include_deleted)
+        return await self._coalesce(
+            key, lambda: self._query(filters, limit, after, fields, include_deleted)
+        )
+
+    async def _query(
+        self,
+        filters: Optional[dict],
+        limit: Optional[int],
+        after: Optional[str],
+        fields: Optional[Tuple[str, ...]],
+        include_deleted: bool,
+    ) -> List[ProductOut]:
+        model = self._model(fields, include_deleted)
+        cursor = self._cursor(filters, limit, after, fields, include_deleted)
         results = await cursor.to_list(length=None)
-        return [ProductOut(**result) for result in results]
+        return [model(**result) for result in results]
 
-    async def update(self, id: UUID, body: ProductUpdate) -> ProductUpdateOut:
+    def _cursor(
+        self,
+        filters: Optional[dict],
+        limit: Optional[int],
+        after: Optional[str],
+        fields: Optional[Tuple[str, ...]],
+        include_deleted: bool,
+    ) -> AsyncIOMotorCursor:
+        # Every listing is a page, so an unbounded one is capped and sorted for
+        # the cursor to continue from.
+        limit = min(limit or settings.QUERY_MAX_RESULTS, settings.QUERY_MAX_RESULTS)
+        return (
+            self._reader("query")
+            .find(
+                visible(self._paginate(filters, after), include_deleted),
+                projection(fields),
+                max_time_ms=max_time("query"),
+                session=current_session.get(),
+            )
+            .sort(SORT_KEY)
+            .limit(limit)
+        )
+
+    def stream(
+        self,
+        filters: dict = None,
+        after: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        include_deleted: bool = False,
+    ) -> AsyncIterator[BaseModel]:
+        model = self._model(fields, include_deleted)
+        # Consumed after the request's session has ended, so it runs without one.
+        cursor = (
+            self._reader("stream")
+            .find(
+                visible(self._paginate(filters, after), include_deleted),
+                projection(fields),
+                max_time_ms=max_time("stream"),
+            )
+            .sort(SORT_KEY)
+        )
+        return (model(**result) async for result in cursor)
+
+    @staticmethod
+    def _model(fields: Optional[Tuple[str, ...]], include_deleted: bool) -> type:
+        if fields:
+            return product_fields_model(fields)
+        return ProductArchivedOut if include_deleted else ProductOut
+
+    @staticmethod
+    def _paginate(filters: Optional[dict], after: Optional[str]) -> dict:
+        if after is None:
+            return filters or {}
+        if not filters:
+            return after_filter(after)
+        return {"$and": [filters, after_filter(after)]}
+
+    @time_limited("search")
+    async def search(
+        self,
+        q: str,
+        prefix: bool = False,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[ProductOut]:
+        if prefix:
+            # An anchored, case-sensitive regex can use the name_lower index
+            # bounds; case-insensitive ones scan every key.
+            name = re.compile("^" + re.escape(q.lower()))
+            cursor = (
+                self._reader("search")
+                .find(visible({"name_lower": name}), session=current_session.get())
+                .sort("name_lower")
+            )
+        else:
+            cursor = (
+                self._reader("search")
+                .find(
+                    visible({"$text": {"$search": q}}),
+                    {"score": {"$meta": "textScore"}},
+                    session=current_session.get(),
+                )
+                .sort([("score", {"$meta": "textScore"})])
+            )
+
+        cursor = cursor.skip(offset).limit(limit)
+        cursor = cursor.max_time_ms(max_time("search"))
+        return [ProductOut(**result) async for result in cursor]
+
+    @time_limited("stats")
+    async def stats(
+        self, buckets: int = 5, boundaries: Optional[List[Decimal]] = None
+    ) -> ProductStats:
+        if boundaries:
+            if len(boundaries) < 2 or sorted(set(boundaries)) != boundaries:
+                raise InvalidQueryException(
+                    message="Price boundaries must be at least two ascending values"
+                )
+            histogram = {
+                "$bucket": {
+                    "groupBy": "$price",
+                    "boundaries": boundaries,
+                    "default": "other",
+                }
+            }
+        else:
+            histogram = {"$bucketAuto": {"groupBy": "$price", "buckets": buckets}}
+
+        pipeline = [
+            {"$match": visible(None)},
+            {
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "count": {"$sum": 1},
+                                "total_quantity": {"$sum": "$quantity"},
+                                "stock_value": {
+                                    "$sum": {"$multiply": ["$price", "$quantity"]}
+                                },
+                            }
+                        }
+                    ],
+                    "by_status": [
+                        {
+                            "$group": {
+                                "_id": "$status",
+                                "count": {"$sum": 1},
+                                "quantity": {"$sum": "$quantity"},
+                            }
+                        },
+                        {"$sort": {"_id": 1}},
+                    ],
+                    "price_histogram": [histogram],
+                }
+            },
+        ]
+        # Unlike find, aggregate would send a null maxTimeMS to the server.
+        options = {"maxTimeMS": max_time("stats")} if max_time("stats") else {}
+        [result] = await (
+            self._reader("stats")
+            .aggregate(pipeline, session=current_session.get(), **options)
+            .to_list(length=1)
+        )
+
+        totals = result["totals"][0] if result["totals"] else {}
+        return ProductStats(
+            count=totals.get("count", 0),
+            total_quantity=totals.get("total_quantity", 0),
+            stock_value=totals.get("stock_value", 0),
+            by_status=[
+                StatusStats(status=item["_id"], **item) for item in result["by_status"]
+            ],
+            price_histogram=[
+                self._price_bucket(item, boundaries)
+                for item in result["price_histogram"]
+            ],
+        )
+
+    @staticmethod
+    def _price_bucket(item: dict, boundaries: Optional[List[Decimal]]) -> PriceBucket:
+        if not boundaries:
+            return PriceBucket(**item["_id"], count=item["count"])
+        if item["_id"] == "other":
+            return PriceBucket(count=item["count"])
+
+        upper = boundaries[boundaries.index(item["_id"]) + 1]
+        return PriceBucket(min=item["_id"], max=upper, count=item["count"])
+
+    async def update(
+        self, id: UUID, body: ProductUpdate, version: Optional[int] = None
+    ) -> ProductUpdateOut:
         update_data = body.model_dump(exclude_none=True)
         if not update_data:
             raise ValueError("No valid fields to update")
 
         update_data["updated_at"] = datetime.now(timezone.utc)
 
+        filters = visible({"id": id})
+        if version is not None:
+            filters["version"] = {"$in": [0, None]} if version == 0 else version
+
         result = await self.collection.find_one_and_update(
-            filter={"id": id},
-            update={"$set": update_data},
+            filter=filters,
+            update={"$set": update_data, "$inc": {"version": 1}},
             return_document=pymongo.ReturnDocument.AFTER,
+            session=current_session.get(),
         )
+        self._invalidate(id)
 
         if result is None:
+            if version is not None and await self.collection.count_documents(
+                visible({"id": id}), limit=1, session=current_session.get()
+            ):
+                raise PreconditionFailedException(
+                    message=f"Product {id} does not match version {version}"
+                )
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
         return ProductUpdateOut(**result)
@@ -78,15 +599,191 @@ class ProductUsecase:
 
         # return ProductUpdateOut(**result)
 
+    async def update_many(
+        self, bodies: List[ProductBulkUpdate]
+    ) -> List[BulkItemResult]:
+        results = []
+        updated_at = datetime.now(timezone.utc)
+
+        for start, batch in batched(bodies, settings.BULK_BATCH_SIZE):
+            requests, written = [], []
+            for index, body in enumerate(batch, start):
+                result = BulkItemResult(index=index, id=body.id, status="updated")
+                results.append(result)
+                update_data = body.model_dump(exclude_none=True, exclude={"id"})
+                if not update_data:
+                    result.status = "error"
+                    result.detail = "No valid fields to update"
+                    continue
+                update_data["updated_at"] = updated_at
+                requests.append(
+                    pymongo.UpdateOne(
+                        visible({"id": body.id}),
+                        {"$set": update_data, "$inc": {"version": 1}},
+                    )
+                )
+                written.append(result)
+
+            if requests:
+                await self._update_batch(requests, written)
+            for body in batch:
+                self._invalidate(body.id)
+
+        return results
+
+    async def _update_batch(
+        self, requests: List[pymongo.UpdateOne], results: List[BulkItemResult]
+    ) -> None:
+        try:
+            outcome = await self.collection.bulk_write(
+                requests, ordered=False, session=current_session.get()
+            )
+            matched = outcome.matched_count
+        except BulkWriteError as exc:
+            matched = exc.details["nMatched"]
+            for error in exc.details["writeErrors"]:
+                result = results[error["index"]]
+                result.status = "error"
+                result.detail = error.get("errmsg")
+        except PyMongoError as exc:
+            # Whether any of the batch was written is unknown.
+            for result in results:
+                result.status = "error"
+                result.detail = str(exc)
+            return
+
+        updated = [result for result in results if result.status == "updated"]
+        if matched < len(updated):
+            # The write result only counts matches; the ids still visible
+            # tell which ones were missing or deleted meanwhile.
+            existing = await self._existing_ids([result.id for result in updated])
+            for result in updated:
+                if result.id not in existing:
+                    result.status = "not_found"
+
+    async def adjust_stock(self, id: UUID, delta: int) -> ProductOut:
+        filters = visible({"id": id})
+        if delta < 0:
+            # The guard and the $inc are one atomic update, so concurrent
+            # checkouts can never take quantity below zero.
+            filters["quantity"] = {"$gte": -delta}
+
+        result = await self.collection.find_one_and_update(
+            filter=filters,
+            update={
+                "$inc": {"quantity": delta, "version": 1},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            },
+            return_document=pymongo.ReturnDocument.AFTER,
+            session=current_session.get(),
+        )
+        self._invalidate(id)
+
+        if result is None:
+            if delta < 0 and await self.collection.count_documents(
+                visible({"id": id}), limit=1, session=current_session.get()
+            ):
+                raise InsufficientStockException(
+                    message=f"Insufficient stock for product {id}"
+                )
+            raise NotFoundException(message=f"Product not found with filter: {id}")
+
+        return ProductOut(**result)
+
+    async def adjust_stock_many(
+        self, bodies: List[ProductBulkStock]
+    ) -> List[BulkItemResult]:
+        async def adjust(index: int, body: ProductBulkStock) -> BulkItemResult:
+            # A session cannot serve concurrent operations; each gathered task
+            # has its own context, so this only affects the task.
+            current_session.set(None)
+            try:
+                await self.adjust_stock(body.id, body.delta)
+            except NotFoundException:
+                return BulkItemResult(index=index, id=body.id, status="not_found")
+            except InsufficientStockException as exc:
+                return BulkItemResult(
+                    index=index,
+                    id=body.id,
+                    status="insufficient_stock",
+                    detail=exc.message,
+                )
+            except PyMongoError as exc:
+                # Reported per item: failing the request would release the
+                # Idempotency-Key and a retry would reapply what already landed.
+                return BulkItemResult(
+                    index=index, id=body.id, status="error", detail=str(exc)
+                )
+            return BulkItemResult(index=index, id=body.id, status="adjusted")
+
+        # Each item needs its own conditional update to report its outcome. A
+        # few run at a time so one request cannot take the whole pool.
+        semaphore = asyncio.Semaphore(settings.BULK_STOCK_CONCURRENCY)
+
+        async def limited(index: int, body: ProductBulkStock) -> BulkItemResult:
+            async with semaphore:
+                return await adjust(index, body)
+
+        return list(
+            await asyncio.gather(
+                *(limited(index, body) for index, body in enumerate(bodies))
+            )
+        )
+
+    async def delete_many(self, ids: List[UUID]) -> List[BulkItemResult]:
+        results = []
+
+        for start, batch in batched(ids, settings.BULK_BATCH_SIZE):
+            existing = await self._existing_ids(batch)
+            if existing:
+                await self._delete(visible({"id": {"$in": list(existing)}}))
+            for id in batch:
+                self._invalidate(id)
+            results.extend(
+                BulkItemResult(
+                    index=index,
+                    id=id,
+                    status="deleted" if id in existing else "not_found",
+                )
+                for index, id in enumerate(batch, start)
+            )
+
+        return results
+
+    async def _existing_ids(self, ids: Sequence[UUID]) -> Set[UUID]:
+        cursor = self.collection.find(
+            visible({"id": {"$in": list(ids)}}),
+            {"id": 1, "_id": 0},
+            session=current_session.get(),
+        )
+        return {document["id"] async for document in cursor}
+
     async def delete(self, id: UUID) -> bool:
-        product = await self.collection.find_one({"id": id})
+        deleted = await self._delete(visible({"id": id}), many=False)
+        self._invalidate(id)
 
-        if not product:
+        if not deleted:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        result = await self.collection.delete_one({"id": id})
+        return True
+
+    async def _delete(self, filters: dict, many: bool = True) -> int:
+        if not settings.SOFT_DELETE:
+            delete = self.collection.delete_many if many else self.collection.delete_one
+            return (await delete(filters, session=current_session.get())).deleted_count
 
-        return True if result.deleted_count > 0 else False
+        now = datetime.now(timezone.utc)
+        update = self.collection.update_many if many else self.collection.update_one
+        result = await update(
+            filters,
+            {"$set": {"deleted_at": now, "updated_at": now}, "$inc": {"version": 1}},
+            session=current_session.get(),
+        )
+        return result.modified_count
 
 
 product_usecase = ProductUsecase()
+
+
+async def get_product_usecase() -> ProductUsecase:
+    return product_usecase
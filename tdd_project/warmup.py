@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from pymongo.errors import PyMongoError
+
+from tdd_project.core.config import settings
+from tdd_project.core.health import readiness
+from tdd_project.db.mongo import db_client
+from tdd_project.usecases.product import product_usecase
+
+logger = logging.getLogger("tdd_project.warmup")
+
+
+async def warmup(app: FastAPI) -> None:
+    readiness.reset()
+    delay = settings.WARMUP_BACKOFF_SECONDS
+    for attempt in range(1, settings.WARMUP_ATTEMPTS + 1):
+        try:
+            await warm(app)
+        except PyMongoError as exc:
+            logger.warning("Warmup attempt %d failed: %s", attempt, exc)
+            readiness.error = str(exc)
+        except Exception as exc:
+            # Not something a retry fixes.
+            logger.exception("Warmup failed")
+            readiness.error = str(exc) or type(exc).__name__
+            readiness.failed = True
+            return
+        else:
+            readiness.error = None
+            readiness.ready = True
+            return
+
+        if attempt < settings.WARMUP_ATTEMPTS:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.WARMUP_BACKOFF_MAX_SECONDS)
+
+    logger.error("Warmup gave up after %d attempts", settings.WARMUP_ATTEMPTS)
+    readiness.failed = True
+
+
+async def warm(app: FastAPI) -> None:
+    client = db_client.get()
+
+    started = time.perf_counter()
+    await client.admin.command("ping")
+    readiness.step("ping", started)
+
+    # Concurrent commands each check out a connection, so the pool is open
+    # before traffic arrives instead of growing during the first requests.
+    started = time.perf_counter()
+    connections = min(settings.WARMUP_CONNECTIONS, settings.MONGO_MAX_POOL_SIZE)
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+    readiness.step("pool", started)
+
+    started = time.perf_counter()
+    app.openapi()
+    readiness.step("schemas", started)
+
+    started = time.perf_counter()
+    await product_usecase.preload(settings.WARMUP_CACHE_SIZE)
+    readiness.step("cache", started)
@@ -1,9 +1,11 @@
 import asyncio
 from uuid import UUID
 import pytest
+from tdd_project.db.indexes import ensure_indexes
 from tdd_project.db.mongo import db_client
+from tdd_project.models.product import ProductModel
 from tdd_project.schemas.product import ProductIn, ProductUpdate
-from tdd_project.usecases.product import product_usecase
+from tdd_project.usecases.product import product_cache, product_usecase
 from tests.factories import product_data, products_data
 from httpx import AsyncClient
 
@@ -32,6 +34,20 @@ async def clear_collections(mongo_client):
         await mongo_client.get_database()[collection_name].delete_many({})
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    product_cache.clear()
+
+
+@pytest.fixture
+async def product_indexes(mongo_client):
+    database = mongo_client.get_database()
+    await ensure_indexes(database)
+    yield
+    await database[ProductModel.collection_name].drop_indexes()
+
+
 @pytest.fixture
 async def client() -> AsyncClient:
     from tdd_project.main import app
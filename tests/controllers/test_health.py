@@ -0,0 +1,64 @@
+import pytest
+from fastapi import status
+from pymongo.errors import AutoReconnect
+
+from tdd_project.core.config import settings
+from tdd_project.core.health import readiness
+from tdd_project.main import app
+from tdd_project.usecases.product import product_usecase
+from tdd_project.warmup import warmup
+
+
+@pytest.mark.asyncio
+async def test_controller_live_should_return_ok(client):
+    response = await client.get("/health/live")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_controller_ready_should_flip_after_warmup(client, products_inserted):
+    readiness.reset()
+    before = await client.get("/health/ready")
+
+    await warmup(app)
+    after = await client.get("/health/ready")
+
+    assert before.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert after.status_code == status.HTTP_200_OK
+    assert set(after.json()["warmup_seconds"]) == {"ping", "pool", "schemas", "cache"}
+
+
+@pytest.mark.asyncio
+async def test_controller_ready_should_retry_warmup(client, monkeypatch):
+    preload = product_usecase.preload
+    failures = [AutoReconnect("mongo is starting")]
+
+    async def flaky(limit):
+        if failures:
+            raise failures.pop()
+        return await preload(limit)
+
+    monkeypatch.setattr(product_usecase, "preload", flaky)
+    monkeypatch.setattr(settings, "WARMUP_BACKOFF_SECONDS", 0)
+
+    await warmup(app)
+    response = await client.get("/health/ready")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_controller_live_should_fail_when_warmup_fails(client, monkeypatch):
+    async def broken(limit):
+        raise ValueError("bad cache entry")
+
+    monkeypatch.setattr(product_usecase, "preload", broken)
+
+    await warmup(app)
+    live = await client.get("/health/live")
+    ready = await client.get("/health/ready")
+    readiness.reset()
+
+    assert live.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert ready.json() == {"detail": "bad cache entry"}
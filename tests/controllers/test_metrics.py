@@ -0,0 +1,26 @@
+import pytest
+from fastapi import status
+
+
+@pytest.mark.asyncio
+async def test_controller_product_should_send_server_timing(
+    client, products_url, product_inserted
+):
+    response = await client.get(f"{products_url}{product_inserted.id}")
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+@pytest.mark.asyncio
+async def test_controller_metrics_should_expose_prometheus_text(
+    client, products_url, product_inserted
+):
+    await client.get(f"{products_url}{product_inserted.id}")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/products/{id}"' in response.text
+    assert "mongo_command_duration_seconds_count" in response.text
+    assert "mongo_pool_checkouts" in response.text
@@ -1,8 +1,12 @@
+import json
 from datetime import datetime, timezone
 from typing import List
+from uuid import uuid4
 import pytest
 from fastapi import status
-from tests.factories import product_data
+from tdd_project.core.config import settings
+from tdd_project.usecases.product import product_cache
+from tests.factories import many_products_data, product_data, products_data
 
 
 @pytest.mark.asyncio
@@ -201,3 +205,343 @@ async def test_controller_create_should_handle_insertion_error(client, products_
             }
         ]
     }
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_controller_query_should_paginate_with_cursor(client, products_url):
+    first = await client.get(products_url, params={"limit": 3})
+    second = await client.get(
+        products_url, params={"limit": 3, "after": first.headers["X-Next-Cursor"]}
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert len(first.json()) == 3
+    assert second.status_code == status.HTTP_200_OK
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_bound_limit_by_result_cap(client, products_url):
+    largest = await client.get(
+        products_url, params={"limit": settings.QUERY_MAX_RESULTS}
+    )
+    oversized = await client.get(
+        products_url, params={"limit": settings.QUERY_MAX_RESULTS + 1}
+    )
+
+    assert largest.status_code == status.HTTP_200_OK
+    assert oversized.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_return_bad_request_for_invalid_cursor(
+    client, products_url
+):
+    response = await client.get(products_url, params={"limit": 3, "after": "bogus"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor: bogus"}
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_controller_query_should_stream_ndjson(client, products_url):
+    response = await client.get(products_url, params={"stream": True})
+
+    lines = response.text.splitlines()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 4
+    assert all(json.loads(line)["name"] for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_controller_post_bulk_should_return_success(client, products_url):
+    response = await client.post(f"{products_url}bulk", json=products_data())
+
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content["succeeded"] == 4
+    assert content["failed"] == 0
+    assert [item["status"] for item in content["items"]] == ["created"] * 4
+
+
+@pytest.mark.asyncio
+async def test_controller_patch_bulk_should_return_success(
+    client, products_url, product_inserted
+):
+    response = await client.patch(
+        f"{products_url}bulk",
+        json=[
+            {"id": str(product_inserted.id), "price": "7.500"},
+            {"id": "57d1002d-de69-48bc-85a3-6377bac97360", "price": "7.500"},
+        ],
+    )
+
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content["succeeded"] == 1
+    assert content["failed"] == 1
+    assert content["items"][1]["status"] == "not_found"
+
+
+@pytest.mark.asyncio
+async def test_controller_delete_bulk_should_return_success(
+    client, products_url, products_inserted
+):
+    response = await client.request(
+        "DELETE",
+        f"{products_url}bulk",
+        json={"ids": [str(product.id) for product in products_inserted]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["succeeded"] == 4
+
+
+@pytest.mark.asyncio
+async def test_controller_patch_should_honor_if_match(
+    client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}"
+    etag = (await client.get(url)).headers["ETag"]
+
+    response = await client.patch(
+        url, json={"price": "7.500"}, headers={"If-Match": etag}
+    )
+    stale = await client.patch(url, json={"price": "6.500"}, headers={"If-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert stale.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_return_sparse_fields(
+    client, products_url, product_inserted
+):
+    response = await client.get(
+        f"{products_url}{product_inserted.id}", params={"fields": "name,price"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "id": str(product_inserted.id),
+        "name": "Iphone 14 pro Max",
+        "price": "8.500",
+    }
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_controller_query_should_return_sparse_fields(client, products_url):
+    response = await client.get(products_url, params={"fields": "name", "limit": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert all(set(product) == {"id", "name"} for product in response.json())
+    assert "X-Next-Cursor" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_reject_unknown_fields(client, products_url):
+    response = await client.get(products_url, params={"fields": "colour"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Unknown fields: colour"}
+
+
+@pytest.mark.usefixtures("product_indexes", "products_inserted")
+@pytest.mark.asyncio
+async def test_controller_search_should_return_success(client, products_url):
+    response = await client.get(
+        f"{products_url}search", params={"q": "iphone 15", "prefix": True}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [product["name"] for product in response.json()] == ["Iphone 15 Pro Max"]
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_controller_stats_should_return_success(client, products_url):
+    response = await client.get(f"{products_url}stats", params={"buckets": 2})
+
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content["count"] == 4
+    assert sum(bucket["count"] for bucket in content["price_histogram"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_return_not_modified(
+    client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}"
+    first = await client.get(url)
+
+    response = await client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert response.headers["Cache-Control"] == first.headers["Cache-Control"]
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_return_not_modified(
+    client, products_url, products_inserted
+):
+    first = await client.get(products_url)
+
+    response = await client.get(
+        products_url, headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_compress_large_listings(client, products_url):
+    await client.post(f"{products_url}bulk", json=list(many_products_data(50)))
+
+    response = await client.get(products_url, headers={"Accept-Encoding": "gzip"})
+    small = await client.get(
+        products_url, params={"limit": 1}, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 50
+    assert "Content-Encoding" not in small.headers
+
+
+@pytest.mark.asyncio
+async def test_controller_post_should_replay_idempotent_requests(client, products_url):
+    headers = {"Idempotency-Key": "create-iphone"}
+    first = await client.post(products_url, json=product_data(), headers=headers)
+    retry = await client.post(products_url, json=product_data(), headers=headers)
+    listed = await client.get(products_url)
+
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.json() == first.json()
+    assert retry.headers["ETag"] == first.headers["ETag"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(listed.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_controller_post_should_reject_reused_idempotency_key(
+    client, products_url
+):
+    headers = {"Idempotency-Key": "create-iphone"}
+    await client.post(products_url, json=product_data(), headers=headers)
+
+    response = await client.post(
+        products_url, json={**product_data(), "quantity": 1}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_include_deleted_on_request(
+    client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}"
+    await client.delete(url)
+
+    hidden = await client.get(url)
+    archived = await client.get(url, params={"include_deleted": True})
+
+    assert hidden.status_code == status.HTTP_404_NOT_FOUND
+    assert archived.status_code == status.HTTP_200_OK
+    assert archived.json()["deleted_at"] is not None
+    assert archived.headers["Cache-Control"] == "private, no-store"
+
+
+@pytest.mark.asyncio
+async def test_controller_lookup_should_return_sparse_products(
+    client, products_url, products_inserted
+):
+    unknown = "1e4f214e-85f7-461a-89d0-a751a32e3bb9"
+    response = await client.post(
+        f"{products_url}lookup",
+        params={"fields": "name"},
+        json={"ids": [unknown, str(products_inserted[0].id)]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": unknown, "found": False, "product": None},
+        {
+            "id": str(products_inserted[0].id),
+            "found": True,
+            "product": {
+                "id": str(products_inserted[0].id),
+                "name": products_inserted[0].name,
+            },
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_controller_lookup_should_read_the_cache(
+    client, products_url, product_inserted
+):
+    await client.get(f"{products_url}{product_inserted.id}")
+    hits = product_cache.stats.hits
+
+    response = await client.post(
+        f"{products_url}lookup", json={"ids": [str(product_inserted.id)]}
+    )
+
+    assert response.json()[0]["found"] is True
+    assert "X-Causal-Token" not in response.headers
+    assert product_cache.stats.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_controller_lookup_should_cap_batch_size(client, products_url):
+    ids = [str(uuid4()) for _ in range(settings.LOOKUP_MAX_IDS + 1)]
+
+    response = await client.post(f"{products_url}lookup", json={"ids": ids})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_controller_stock_should_reject_overselling(
+    client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}/stock"
+
+    taken = await client.post(url, json={"delta": -4})
+    oversold = await client.post(url, json={"delta": -7})
+
+    assert taken.status_code == status.HTTP_200_OK
+    assert taken.json()["quantity"] == 6
+    assert oversold.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+async def test_controller_should_read_own_writes_with_causal_token(
+    client, products_url
+):
+    created = await client.post(products_url, json=product_data())
+    token = created.headers["X-Causal-Token"]
+
+    response = await client.get(
+        f"{products_url}{created.json()['id']}", headers={"X-Causal-Token": token}
+    )
+    invalid = await client.get(products_url, headers={"X-Causal-Token": "bogus"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == created.json()["id"]
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
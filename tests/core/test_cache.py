@@ -0,0 +1,58 @@
+import time
+from tdd_project.core.cache import MISSING, LRUCache
+
+
+def test_cache_should_return_cached_value():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cache_should_evict_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_cache_should_expire_entries(monkeypatch):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_cache_should_not_store_reads_raced_by_a_change():
+    cache = LRUCache(maxsize=2, ttl=60)
+    since = cache.generation
+    cache.delete("a")
+    cache.set("a", "stale", since=since)
+    cache.set("b", 2, since=since)
+
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == 2
+
+    cache.clear()
+    cache.set("b", "stale", since=since)
+    assert cache.get("b") is MISSING
+
+
+def test_cache_should_treat_forgotten_changes_as_recent():
+    cache = LRUCache(maxsize=1, ttl=60)
+    since = cache.generation
+    cache.delete("a")
+    cache.delete("b")
+    cache.set("a", "stale", since=since)
+
+    assert cache.get("a") is MISSING
@@ -0,0 +1,39 @@
+from tdd_project.core.events import CLOSED, Event, EventBroker
+
+
+def event(id: str) -> Event:
+    return Event(id=id, name="update", data="{}")
+
+
+def test_event_should_render_as_server_sent_event():
+    assert event("a").render() == "id: a\nevent: update\ndata: {}\n\n"
+
+
+def test_broker_should_fan_out_to_subscribers():
+    broker = EventBroker(queue_size=10, history_size=10)
+    first, second = broker.subscribe(), broker.subscribe()
+
+    broker.publish(event("a"))
+
+    assert first.get_nowait() == second.get_nowait() == event("a")
+
+
+def test_broker_should_replay_history_after_last_event_id():
+    broker = EventBroker(queue_size=10, history_size=10)
+    for id in "abc":
+        broker.publish(event(id))
+
+    queue = broker.subscribe(last_event_id="a")
+
+    assert [queue.get_nowait().id for _ in range(queue.qsize())] == ["b", "c"]
+
+
+def test_broker_should_close_slow_subscribers():
+    broker = EventBroker(queue_size=2, history_size=10)
+    queue = broker.subscribe()
+    for id in "abc":
+        broker.publish(event(id))
+
+    assert queue.get_nowait() is CLOSED
+    assert queue not in broker.subscribers
+    assert broker.dropped == 1
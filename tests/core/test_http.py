@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from tdd_project.core.exceptions import PreconditionFailedException
+from tdd_project.core.http import (
+    PydanticJSONResponse,
+    etag,
+    http_date,
+    is_not_modified,
+    parse_if_match,
+)
+
+updated_at = datetime(2024, 3, 1, 12, 30, 15, 250000)
+
+
+def test_http_date_should_format_naive_datetimes_as_gmt():
+    assert http_date(updated_at) == "Fri, 01 Mar 2024 12:30:15 GMT"
+
+
+def test_is_not_modified_should_match_etags_weakly():
+    assert is_not_modified('"2"', None, 'W/"2"', None)
+    assert is_not_modified('"2"', None, '"1", "2"', None)
+    assert is_not_modified('"2"', None, "*", None)
+    assert not is_not_modified('"2"', None, '"1"', None)
+
+
+def test_is_not_modified_should_prefer_if_none_match_over_dates():
+    assert not is_not_modified('"2"', updated_at, '"1"', http_date(updated_at))
+
+
+def test_is_not_modified_should_compare_dates_to_the_second():
+    assert is_not_modified('"2"', updated_at, None, http_date(updated_at))
+    earlier = http_date(updated_at - timedelta(seconds=1))
+    assert not is_not_modified('"2"', updated_at, None, earlier)
+    assert not is_not_modified('"2"', updated_at, None, "not a date")
+
+
+def test_is_not_modified_should_read_unknown_zones_as_utc():
+    assert is_not_modified('"2"', updated_at, None, "Fri, 01 Mar 2024 12:30:15 -0000")
+    assert not is_not_modified(
+        '"2"', updated_at, None, "Fri, 01 Mar 2024 12:30:14 -0000"
+    )
+
+
+def test_etag_should_include_sparse_fields():
+    assert etag(3) == '"3"'
+    assert etag(3, ("id", "name")) == '"3-id.name"'
+
+
+def test_parse_if_match_should_reject_malformed_tags():
+    assert parse_if_match('W/"4"') == 4
+    with pytest.raises(PreconditionFailedException):
+        parse_if_match('"abc"')
+
+
+def test_pydantic_json_response_should_encode_decimals_uuids_and_datetimes():
+    product_id = uuid4()
+    response = PydanticJSONResponse(
+        {"id": product_id, "price": Decimal("8.500"), "updated_at": updated_at}
+    )
+
+    assert json.loads(response.body) == {
+        "id": str(product_id),
+        "price": "8.500",
+        "updated_at": "2024-03-01T12:30:15.250000",
+    }
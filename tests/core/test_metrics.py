@@ -0,0 +1,59 @@
+from tdd_project.core.metrics import (
+    Histogram,
+    Metrics,
+    RequestTimings,
+    render_counters,
+)
+
+
+def test_histogram_should_render_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    assert histogram.render("latency", 'route="/"') == [
+        'latency_bucket{route="/",le="0.1"} 1',
+        'latency_bucket{route="/",le="1.0"} 2',
+        'latency_bucket{route="/",le="+Inf"} 2',
+        'latency_sum{route="/"} 0.55',
+        'latency_count{route="/"} 2',
+    ]
+
+
+def test_metrics_should_count_requests_by_route():
+    metrics = Metrics()
+    metrics.observe_request("GET", "/products/{id}", 200, 0.01)
+    metrics.observe_request("GET", "/products/{id}", 200, 0.02)
+
+    assert (
+        'http_requests_total{method="GET",route="/products/{id}",status="200"} 2'
+        in metrics.render()
+    )
+
+
+def test_request_timings_should_format_server_timing():
+    timings = RequestTimings(db_seconds=0.002, db_commands=1)
+
+    assert timings.server_timing(0.005) == (
+        'db;dur=2.00;desc="1 commands", app;dur=3.00, total;dur=5.00'
+    )
+
+
+def test_request_timings_should_describe_the_matched_route():
+    class Route:
+        path = "/products/{id}"
+
+    scope = {"method": "GET", "path": "/products/1e4f214e"}
+    timings = RequestTimings(scope=scope)
+    assert timings.describe() == "GET /products/1e4f214e"
+
+    scope["route"] = Route()
+    assert timings.describe() == "GET /products/{id}"
+    assert RequestTimings().describe() == "-"
+
+
+def test_render_counters_should_use_total_suffix():
+    assert list(render_counters("product_cache", {"hits": 3})) == [
+        "# TYPE product_cache_hits_total counter",
+        "product_cache_hits_total 3",
+    ]
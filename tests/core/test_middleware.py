@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from tdd_project.core.middleware import (
+    CompressionMiddleware,
+    ConcurrencyLimitMiddleware,
+    ConcurrencyStats,
+)
+
+
+def limited_app(release: asyncio.Event, stats: ConcurrencyStats, **options):
+    async def slow(request):
+        await release.wait()
+        return PlainTextResponse("ok")
+
+    async def health(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/slow", slow), Route("/health/live", health)])
+    settings = {"max_concurrent": 1, "max_queued": 1, "queue_timeout": 1.0}
+    return ConcurrencyLimitMiddleware(
+        app, retry_after=3, stats=stats, **{**settings, **options}
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_should_shed_when_queue_is_full():
+    release, stats = asyncio.Event(), ConcurrencyStats()
+    app = limited_app(release, stats)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        running = asyncio.create_task(client.get("/slow"))
+        queued = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        assert (stats.in_flight, stats.waiting) == (1, 1)
+
+        shed = await client.get("/slow")
+        disguised = await client.get("/slow", headers={"Accept": "text/event-stream"})
+        probe = await client.get("/health/live")
+        release.set()
+        responses = await asyncio.gather(running, queued)
+
+    assert shed.status_code == disguised.status_code == 503
+    assert shed.headers["Retry-After"] == "3"
+    assert probe.status_code == 200
+    assert [response.status_code for response in responses] == [200, 200]
+    assert (stats.in_flight, stats.waiting, stats.rejected) == (0, 0, 2)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_should_shed_after_queue_timeout():
+    release, stats = asyncio.Event(), ConcurrencyStats()
+    app = limited_app(release, stats, queue_timeout=0.01)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        running = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        timed_out = await client.get("/slow")
+        release.set()
+        await running
+
+    assert timed_out.status_code == 503
+    assert stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_compression_should_skip_uncompressed_paths():
+    async def body(request):
+        return PlainTextResponse("x" * 2000)
+
+    app = CompressionMiddleware(
+        Starlette(routes=[Route("/events", body), Route("/list", body)]),
+        minimum_size=100,
+        uncompressed=("/events",),
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        events = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+        listing = await client.get(
+            "/list",
+            headers={"Accept-Encoding": "gzip", "Accept": "text/event-stream"},
+        )
+
+    assert "Content-Encoding" not in events.headers
+    assert listing.headers["Content-Encoding"] == "gzip"
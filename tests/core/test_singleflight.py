@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from tdd_project.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_singleflight_should_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["product"]
+
+    results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (flight.stats.executed, flight.stats.coalesced) == (1, 4)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_should_share_errors_and_retry_afterwards():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(ValueError):
+        await flight.do("key", fail)
+    assert flight.stats.executed == 2
+
+
+@pytest.mark.asyncio
+async def test_singleflight_should_survive_the_first_caller_cancelling():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return "product"
+
+    leader = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "product"
+
+
+@pytest.mark.asyncio
+async def test_singleflight_should_forget_keys():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def load():
+        await gate.wait()
+        return "stale"
+
+    waiting = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    flight.forget(lambda key: key == "key")
+
+    async def fresh():
+        return "fresh"
+
+    assert await flight.do("key", fresh) == "fresh"
+    gate.set()
+    assert await waiting == "stale"
@@ -0,0 +1,19 @@
+import pytest
+from tdd_project.db.backfill import backfill_name_lower
+from tdd_project.models.product import ProductModel
+from tdd_project.usecases.product import product_usecase
+from tests.factories import product_data
+
+
+@pytest.mark.asyncio
+async def test_backfill_name_lower_should_make_products_searchable(mongo_client):
+    database = mongo_client.get_database()
+    collection = database[ProductModel.collection_name]
+    legacy = ProductModel(**product_data()).model_dump(exclude={"name_lower"})
+    malformed = {**legacy, "id": ProductModel(**product_data()).id, "name": None}
+    await collection.insert_many([legacy, malformed])
+
+    assert await backfill_name_lower(database) == 1
+    assert await backfill_name_lower(database) == 0
+    result = await product_usecase.search("iphone 14", prefix=True)
+    assert [product.name for product in result] == ["Iphone 14 pro Max"]
@@ -0,0 +1,20 @@
+from decimal import Decimal
+
+import bson
+from bson import Decimal128
+from bson.codec_options import CodecOptions
+from tdd_project.db.codecs import type_registry
+
+OPTIONS = CodecOptions(type_registry=type_registry)
+
+
+def test_decimal_codec_should_encode_decimal128():
+    raw = bson.encode({"price": Decimal("8.500")}, codec_options=OPTIONS)
+
+    assert bson.decode(raw) == {"price": Decimal128("8.500")}
+
+
+def test_decimal_codec_should_decode_decimal():
+    raw = bson.encode({"price": Decimal128("8.500")})
+
+    assert bson.decode(raw, codec_options=OPTIONS) == {"price": Decimal("8.500")}
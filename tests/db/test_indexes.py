@@ -0,0 +1,69 @@
+import pytest
+from tdd_project.core.config import settings
+from tdd_project.db.indexes import ensure_indexes, report
+from tdd_project.models.product import ProductModel
+
+
+@pytest.fixture
+async def database(mongo_client):
+    database = mongo_client.get_database()
+    yield database
+    await database[ProductModel.collection_name].drop_indexes()
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_should_create_declared_indexes(database):
+    await ensure_indexes(database)
+
+    indexes = await database[ProductModel.collection_name].index_information()
+
+    assert indexes["id_unique"]["unique"] is True
+    assert indexes["price_status_created_at_active"]["key"] == [
+        ("price", 1),
+        ("status", 1),
+        ("created_at", 1),
+    ]
+    assert indexes["price_status_created_at_active"]["partialFilterExpression"] == {
+        "deleted_at": None
+    }
+    assert "expireAfterSeconds" in indexes["deleted_at_ttl"]
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_should_be_idempotent(database):
+    await ensure_indexes(database)
+    await ensure_indexes(database)
+
+    result = await report(database)
+
+    assert result[ProductModel.collection_name]["missing"] == []
+    assert result[ProductModel.collection_name]["undeclared"] == []
+
+
+@pytest.mark.asyncio
+async def test_report_should_list_missing_indexes(database):
+    await database[ProductModel.collection_name].drop_indexes()
+
+    result = await report(database)
+
+    assert result[ProductModel.collection_name]["missing"] == sorted(
+        index.document["name"] for index in ProductModel.indexes
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_should_apply_changed_ttls(database):
+    await ensure_indexes(database)
+    await database.command(
+        "collMod",
+        ProductModel.collection_name,
+        index={"name": "deleted_at_ttl", "expireAfterSeconds": 1},
+    )
+
+    await ensure_indexes(database)
+
+    indexes = await database[ProductModel.collection_name].index_information()
+    assert (
+        indexes["deleted_at_ttl"]["expireAfterSeconds"]
+        == settings.SOFT_DELETE_RETENTION_SECONDS
+    )
@@ -0,0 +1,26 @@
+import pytest
+from tdd_project.core.config import settings
+from tdd_project.db.mongo import MongoClient, db_client
+
+
+def test_mongo_client_should_apply_pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "MONGO_MAX_IDLE_TIME_MS", 1000)
+    client = MongoClient()
+
+    options = client.connect().options.pool_options
+    client.close()
+
+    assert options.max_pool_size == 7
+    assert options.max_idle_time_seconds == 1
+    assert client.client is None
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_should_count_checkouts(mongo_client):
+    before = db_client.pool_metrics.checkouts
+
+    await mongo_client.get_database().command("ping")
+
+    assert db_client.pool_metrics.checkouts > before
+    assert db_client.pool_metrics.in_use == 0
@@ -0,0 +1,68 @@
+import pytest
+from bson import Timestamp
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from tdd_project.core.exceptions import InvalidQueryException
+from tdd_project.db.routing import (
+    apply_causal_token,
+    encode_causal_token,
+    read_from,
+    read_mode,
+    read_override,
+    read_preference,
+)
+
+
+class Session:
+    def __init__(self, operation_time=None, cluster_time=None):
+        self.operation_time = operation_time
+        self.cluster_time = cluster_time
+
+    def advance_cluster_time(self, cluster_time):
+        self.cluster_time = cluster_time
+
+    def advance_operation_time(self, operation_time):
+        self.operation_time = operation_time
+
+
+def test_read_preference_should_bound_secondary_staleness():
+    assert read_preference("primary") == Primary()
+    assert isinstance(read_preference("secondaryPreferred"), SecondaryPreferred)
+    assert read_preference("secondaryPreferred").max_staleness == 90
+    with pytest.raises(ValueError):
+        read_preference("anywhere")
+
+
+def test_read_mode_should_follow_routes_and_overrides():
+    assert read_mode("get") == "primary"
+    assert read_mode("stats") == "secondaryPreferred"
+
+    token = read_override.set("primary")
+    try:
+        assert read_mode("stats") == "primary"
+    finally:
+        read_override.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_read_from_should_pin_the_route():
+    token = read_override.set(None)
+    try:
+        await read_from("nearest")()
+        assert read_mode("get") == "nearest"
+    finally:
+        read_override.reset(token)
+
+
+def test_causal_token_should_round_trip():
+    cluster_time = {"clusterTime": Timestamp(1700000000, 3), "signature": {}}
+    written = Session(Timestamp(1700000000, 3), cluster_time)
+    reading = Session()
+
+    apply_causal_token(reading, encode_causal_token(written))
+
+    assert reading.operation_time == Timestamp(1700000000, 3)
+    assert reading.cluster_time == cluster_time
+    assert encode_causal_token(Session()) is None
+    with pytest.raises(InvalidQueryException):
+        apply_causal_token(reading, "bogus")
@@ -14,3 +14,13 @@ def products_data():
             "status": False,
         },
     ]
+
+
+def many_products_data(count):
+    templates = products_data()
+    for index in range(count):
+        product = dict(templates[index % len(templates)])
+        product["name"] = f"{product['name']} #{index}"
+        product["quantity"] += index % 50
+        product["price"] = f"{float(product['price']) + (index % 1000) / 100:.3f}"
+        yield product
@@ -0,0 +1,26 @@
+from decimal import Decimal
+import pytest
+from tdd_project.core.exceptions import InvalidQueryException
+from tdd_project.schemas.filters import ProductFilter
+
+
+def test_filters_should_compile_exclusive_bounds():
+    filters = ProductFilter(min_price="5.5", max_price=8000, status=True)
+
+    assert filters.compile() == {
+        "price": {"$gt": Decimal("5.5"), "$lt": Decimal("8000")},
+        "status": True,
+    }
+
+
+def test_filters_should_compile_inclusive_bounds():
+    filters = ProductFilter(min_quantity=1, max_quantity=10, inclusive=True)
+
+    assert filters.compile() == {"quantity": {"$gte": 1, "$lte": 10}}
+
+
+def test_filters_should_raise_on_inverted_range():
+    with pytest.raises(InvalidQueryException) as err:
+        ProductFilter(min_price=10, max_price=5).compile()
+
+    assert err.value.message == "Invalid price range: 10 > 5"
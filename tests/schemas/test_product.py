@@ -1,6 +1,7 @@
 from pydantic import ValidationError
 import pytest
-from tdd_project.schemas.product import ProductIn
+from tdd_project.core.exceptions import InvalidQueryException
+from tdd_project.schemas.product import ProductIn, parse_fields, product_fields_model
 from tests.factories import product_data
 
 
@@ -24,3 +25,28 @@ def test_schemas_return_raise():
         "input": {"name": "Iphone 14 pro Max", "quantity": 10, "price": 8500},
         "url": "https://errors.pydantic.dev/2.8/v/missing",
     }
+
+
+def test_schemas_parse_fields_should_return_canonical_order():
+    assert parse_fields("price, name") == ("id", "name", "price")
+    assert parse_fields(None) is None
+
+
+def test_schemas_parse_fields_should_raise_unknown_field():
+    with pytest.raises(InvalidQueryException) as err:
+        parse_fields("name,colour")
+
+    assert err.value.message == "Unknown fields: colour"
+
+
+def test_schemas_product_fields_model_should_be_cached():
+    model = product_fields_model(("id", "name"))
+
+    assert model is product_fields_model(("id", "name"))
+    assert set(model.model_fields) == {
+        "id",
+        "name",
+        "created_at",
+        "updated_at",
+        "version",
+    }
@@ -0,0 +1,123 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from tdd_project.core.cache import MISSING, LRUCache
+from tdd_project.core.events import EventBroker
+from tdd_project.models.product import ProductModel
+from tdd_project.schemas.product import ProductOut
+from tdd_project.usecases.events import ProductChangeFeed, product_events, product_feed
+from tdd_project.usecases.product import product_usecase
+from tests.factories import product_data
+
+
+@pytest.fixture
+def feed():
+    return ProductChangeFeed(
+        cache=LRUCache(maxsize=10, ttl=60),
+        broker=EventBroker(queue_size=10, history_size=10),
+    )
+
+
+def stored():
+    return ProductOut(**ProductModel(**product_data()).model_dump())
+
+
+def change(operation, document=None, before=None):
+    return {
+        "_id": {"_data": uuid4().hex},
+        "operationType": operation,
+        "fullDocument": document,
+        "fullDocumentBeforeChange": before,
+    }
+
+
+def test_feed_should_refresh_cached_products(feed):
+    product = stored()
+    feed.cache.set(product.id, product)
+    updated = product.model_copy(update={"quantity": 1, "version": 2})
+
+    event = feed.apply(change("update", dict(updated)))
+
+    assert feed.cache.get(product.id) == updated
+    assert event.product == updated
+    assert feed.broker.history[-1].name == "update"
+
+
+def test_feed_should_not_cache_products_nobody_read(feed):
+    product = stored()
+
+    feed.apply(change("insert", dict(product)))
+
+    assert feed.cache.get(product.id) is MISSING
+
+
+def test_feed_should_evict_deleted_products(feed):
+    product = stored()
+    other = stored()
+    feed.cache.set(product.id, product)
+    feed.cache.set(other.id, other)
+
+    event = feed.apply(change("delete", before=dict(product)))
+
+    assert event.id == product.id
+    assert feed.cache.get(product.id) is MISSING
+    assert feed.cache.get(other.id) == other
+
+
+def test_feed_should_treat_soft_deletes_as_deletes(feed):
+    product = stored()
+    feed.cache.set(product.id, product)
+    deleted = {**dict(product), "deleted_at": product.updated_at}
+
+    event = feed.apply(change("update", deleted))
+
+    assert event.operation == "delete"
+    assert feed.cache.get(product.id) is MISSING
+
+
+def test_feed_should_skip_unreadable_changes(feed):
+    product = stored()
+    other = stored()
+    feed.cache.set(product.id, product)
+    feed.cache.set(other.id, other)
+
+    invalid = feed.consume(change("update", {**dict(product), "price": "n/a"}))
+    assert invalid is None
+    assert feed.cache.get(product.id) is MISSING
+    assert feed.cache.get(other.id) == other
+
+    assert feed.consume(change("delete", before={"name": "no id"})) is None
+    assert feed.cache.get(other.id) is MISSING
+    assert len(feed.broker.history) == 0
+
+
+def test_feed_should_clear_cache_without_pre_images(feed):
+    product = stored()
+    feed.cache.set(product.id, product)
+
+    feed.apply(change("delete"))
+
+    assert len(feed.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_feed_should_publish_changes_from_mongo(product_in):
+    product_feed.start()
+    try:
+        for _ in range(50):
+            if product_feed.running:
+                break
+            await asyncio.sleep(0.1)
+        if not product_feed.running:
+            pytest.skip("Change streams need a replica set")
+
+        queue = product_events.subscribe()
+        product = await product_usecase.create(body=product_in)
+        event = await asyncio.wait_for(queue.get(), timeout=5)
+    finally:
+        await product_feed.stop()
+
+    assert event.name == "insert"
+    assert str(product.id) in event.data
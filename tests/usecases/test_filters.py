@@ -0,0 +1,66 @@
+import pytest
+from tdd_project.schemas.filters import ProductFilter
+from tdd_project.schemas.product import ProductBulkIn
+from tdd_project.usecases.product import product_usecase
+from tests.factories import many_products_data
+
+
+def index_scans(plan: dict) -> set[str]:
+    found = {plan["indexName"]} if plan["stage"] == "IXSCAN" else set()
+    for child in [plan.get("inputStage"), *plan.get("inputStages", [])]:
+        if child:
+            found |= index_scans(child)
+    return found
+
+
+async def winning_indexes(filters: ProductFilter) -> set[str]:
+    # The cursor _query sends, sort and limit included: they change the plan.
+    cursor = product_usecase._cursor(filters.compile(), None, None, None, False)
+    explain = await cursor.explain()
+    plan = explain["queryPlanner"]["winningPlan"]
+    # Slot-based engine plans nest the classic plan under queryPlan.
+    return index_scans(plan.get("queryPlan", plan))
+
+
+@pytest.fixture
+async def many_products_inserted():
+    # Enough products for a selective range to beat walking the sort index.
+    bodies = [ProductBulkIn(**product) for product in many_products_data(2000)]
+    await product_usecase.create_many(bodies)
+
+
+@pytest.mark.usefixtures("product_indexes", "many_products_inserted")
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        (
+            ProductFilter(min_price="5.000", max_price="5.100"),
+            "price_status_created_at_active",
+        ),
+        (
+            ProductFilter(min_price="14.500", status=True, inclusive=True),
+            "price_status_created_at_active",
+        ),
+        (
+            ProductFilter(min_quantity=5, max_quantity=6, status=True),
+            "quantity_status_active",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_filters_should_use_their_index(filters, index):
+    assert await winning_indexes(filters) == {index}
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_filters_should_match_decimal_prices():
+    result = await product_usecase.query(
+        ProductFilter(min_price="5.500", max_price="10.500", inclusive=True).compile()
+    )
+
+    assert sorted(str(product.price) for product in result) == [
+        "10.500",
+        "5.500",
+        "6.500",
+    ]
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tdd_project.core.exceptions import ConflictException
+from tdd_project.core.http import json_response
+from tdd_project.db.indexes import ensure_indexes
+from tdd_project.models.idempotency import IdempotencyKeyModel
+from tdd_project.usecases.idempotency import fingerprint, idempotency_usecase
+
+
+@pytest.fixture
+async def idempotency_indexes(mongo_client):
+    database = mongo_client.get_database()
+    await ensure_indexes(database)
+    yield
+    await database[IdempotencyKeyModel.collection_name].drop_indexes()
+
+
+def record(created_at=None):
+    record = IdempotencyKeyModel(scope="POST /", key="k", fingerprint=fingerprint({}))
+    if created_at is not None:
+        record.created_at = created_at
+    return record
+
+
+@pytest.mark.asyncio
+async def test_usecase_should_reject_keys_in_progress(idempotency_indexes):
+    await idempotency_usecase.acquire(record())
+
+    with pytest.raises(ConflictException):
+        await idempotency_usecase.acquire(record())
+
+
+@pytest.mark.asyncio
+async def test_usecase_should_take_over_abandoned_keys(idempotency_indexes):
+    abandoned = datetime.now(timezone.utc) - timedelta(hours=1)
+    await idempotency_usecase.acquire(record(created_at=abandoned))
+
+    assert await idempotency_usecase.acquire(record()) is None
+
+
+@pytest.mark.asyncio
+async def test_usecase_should_release_keys_when_the_request_fails(
+    idempotency_indexes,
+):
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return json_response({"ok": True})
+
+    with pytest.raises(RuntimeError):
+        await idempotency_usecase.run("POST /", "k", {}, handler)
+    response = await idempotency_usecase.run("POST /", "k", {}, handler)
+    replay = await idempotency_usecase.run("POST /", "k", {}, handler)
+
+    assert response.body == replay.body == b'{"ok":true}'
+    assert len(calls) == 2
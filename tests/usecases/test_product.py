@@ -1,10 +1,29 @@
+import asyncio
+from decimal import Decimal
 from typing import List
 from uuid import UUID
 import pytest
-from tdd_project.usecases.product import product_usecase
-from tdd_project.schemas.product import ProductOut, ProductUpdateOut
+from pymongo.errors import AutoReconnect
+from tdd_project.core.pagination import encode_cursor
+from tdd_project.models.product import ProductModel
+from tdd_project.usecases.product import get_product_usecase, product_usecase
+from tdd_project.schemas.product import (
+    ProductBulkIn,
+    ProductBulkStock,
+    ProductBulkUpdate,
+    ProductOut,
+    ProductUpdateOut,
+)
 
-from tdd_project.core.exceptions import NotFoundException
+from tdd_project.core.exceptions import (
+    InsufficientStockException,
+    InvalidQueryException,
+    NotFoundException,
+    PreconditionFailedException,
+    QueryTimeoutException,
+)
+from tdd_project.core.config import settings
+from tests.factories import product_data
 
 
 @pytest.mark.asyncio
@@ -51,6 +70,36 @@ async def test_usecases_update_should_return_success(product_inserted, product_u
     assert isinstance(result, ProductUpdateOut)
 
 
+@pytest.mark.asyncio
+async def test_usecases_get_should_not_cache_a_read_raced_by_an_update(
+    monkeypatch, product_inserted, product_up
+):
+    reader = product_usecase._reader
+    read, resume = asyncio.Event(), asyncio.Event()
+
+    class Paused:
+        def __init__(self, collection):
+            self.collection = collection
+
+        async def find_one(self, *args, **kwargs):
+            result = await self.collection.find_one(*args, **kwargs)
+            read.set()
+            await resume.wait()
+            return result
+
+    monkeypatch.setattr(product_usecase, "_reader", lambda op: Paused(reader(op)))
+    stale = asyncio.create_task(product_usecase.get(id=product_inserted.id))
+    await read.wait()
+    product_up.price = "9.000"
+    await product_usecase.update(id=product_inserted.id, body=product_up)
+    resume.set()
+    await stale
+    monkeypatch.undo()
+
+    product = await product_usecase.get(id=product_inserted.id)
+    assert product.price == Decimal("9.000")
+
+
 @pytest.mark.asyncio
 async def test_usecases_delete_should_return_success(product_inserted):
     result = await product_usecase.delete(id=product_inserted.id)
@@ -67,3 +116,318 @@ async def test_usecases_delete_should_return_not_found():
         err.value.message
         == "Product not found with filter: 1e4f214e-85f7-461a-89d0-a751a32e3bb9"
     )
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_query_should_paginate_with_cursor():
+    first_page = await product_usecase.query(limit=2)
+    last = first_page[-1]
+    second_page = await product_usecase.query(
+        limit=2, after=encode_cursor(last.created_at, last.id)
+    )
+
+    assert len(first_page) == 2
+    assert len(second_page) == 2
+    assert not {p.id for p in first_page} & {p.id for p in second_page}
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_stream_should_return_success():
+    result = [product async for product in product_usecase.stream()]
+
+    assert len(result) == 4
+    assert all(isinstance(product, ProductOut) for product in result)
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_query_should_cap_results(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_MAX_RESULTS", 3)
+
+    unbounded = await product_usecase.query()
+    oversized = await product_usecase.query(limit=10)
+
+    assert len(unbounded) == len(oversized) == 3
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_query_should_raise_query_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_MAX_TIME_MS", {"query": 10})
+
+    with pytest.raises(QueryTimeoutException) as err:
+        await product_usecase.query({"$where": "sleep(100) || true"})
+
+    assert err.value.message == "Product query exceeded 10ms"
+
+
+@pytest.mark.asyncio
+async def test_usecases_query_should_raise_invalid_cursor():
+    with pytest.raises(InvalidQueryException) as err:
+        await product_usecase.query(limit=2, after="not-a-cursor")
+
+    assert err.value.message == "Invalid cursor: not-a-cursor"
+
+
+@pytest.mark.usefixtures("product_indexes")
+@pytest.mark.asyncio
+async def test_usecases_create_many_should_report_duplicates(product_inserted):
+    bodies = [
+        ProductBulkIn(**product_data()),
+        ProductBulkIn(**product_data(), id=product_inserted.id),
+    ]
+
+    result = await product_usecase.create_many(bodies)
+
+    assert [item.status for item in result] == ["created", "error"]
+    assert result[1].detail == "A product with the same ID already exists."
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_many_should_return_success(products_inserted):
+    unknown = UUID("1e4f214e-85f7-461a-89d0-a751a32e3bb9")
+    bodies = [
+        ProductBulkUpdate(id=products_inserted[0].id, quantity=1),
+        ProductBulkUpdate(id=unknown, quantity=1),
+    ]
+
+    result = await product_usecase.update_many(bodies)
+    updated = await product_usecase.get(id=products_inserted[0].id)
+
+    assert [item.status for item in result] == ["updated", "not_found"]
+    assert updated.quantity == 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_many_should_report_write_errors(
+    mongo_client, products_inserted
+):
+    broken = ProductModel(**product_data()).model_dump()
+    # $inc fails on a non-numeric version, which fails only this item.
+    broken["version"] = "one"
+    await mongo_client.get_database()[ProductModel.collection_name].insert_one(broken)
+    unknown = UUID("1e4f214e-85f7-461a-89d0-a751a32e3bb9")
+    bodies = [
+        ProductBulkUpdate(id=products_inserted[0].id, quantity=1),
+        ProductBulkUpdate(id=broken["id"], quantity=1),
+        ProductBulkUpdate(id=unknown, quantity=1),
+    ]
+
+    result = await product_usecase.update_many(bodies)
+
+    assert [item.status for item in result] == ["updated", "error", "not_found"]
+    assert "$inc" in result[1].detail
+
+
+@pytest.mark.asyncio
+async def test_usecases_delete_many_should_return_success(products_inserted):
+    unknown = UUID("1e4f214e-85f7-461a-89d0-a751a32e3bb9")
+
+    result = await product_usecase.delete_many([products_inserted[0].id, unknown])
+
+    assert [item.status for item in result] == ["deleted", "not_found"]
+    assert len(await product_usecase.query()) == 3
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_be_served_from_cache(product_inserted):
+    first = await product_usecase.get(id=product_inserted.id)
+    hits = product_usecase.cache.stats.hits
+    second = await product_usecase.get(id=product_inserted.id)
+
+    assert second is first
+    assert product_usecase.cache.stats.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_should_invalidate_cache(product_inserted, product_up):
+    await product_usecase.get(id=product_inserted.id)
+    product_up.price = "7.500"
+    await product_usecase.update(id=product_inserted.id, body=product_up)
+
+    result = await product_usecase.get(id=product_inserted.id)
+
+    assert result.price == Decimal("7.500")
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_cache_not_found(product_in):
+    id = UUID("1e4f214e-85f7-461a-89d0-a751a32e3bb9")
+    with pytest.raises(NotFoundException):
+        await product_usecase.get(id=id)
+    await product_usecase.collection.insert_one(
+        ProductModel(**product_in.model_dump(), id=id).model_dump()
+    )
+
+    with pytest.raises(NotFoundException):
+        await product_usecase.get(id=id)
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_should_increment_version(product_inserted, product_up):
+    result = await product_usecase.update(
+        id=product_inserted.id, body=product_up, version=product_inserted.version
+    )
+
+    assert result.version == product_inserted.version + 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_update_should_raise_precondition_failed(
+    product_inserted, product_up
+):
+    with pytest.raises(PreconditionFailedException) as err:
+        await product_usecase.update(id=product_inserted.id, body=product_up, version=7)
+
+    assert (
+        err.value.message == f"Product {product_inserted.id} does not match version 7"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_product_usecase_should_return_shared_instance():
+    assert await get_product_usecase() is product_usecase
+    assert await get_product_usecase() is await get_product_usecase()
+
+
+@pytest.mark.usefixtures("product_indexes", "products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_search_should_rank_text_matches():
+    result = await product_usecase.search("Iphone 13")
+
+    assert result[0].name == "Iphone 13 Pro Max"
+    assert len(result) == 4
+
+
+@pytest.mark.usefixtures("product_indexes", "products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_search_should_match_prefix():
+    result = await product_usecase.search("iphone 1", prefix=True, limit=2)
+
+    assert [product.name for product in result] == [
+        "Iphone 11 Pro Max",
+        "Iphone 12 Pro Max",
+    ]
+
+
+@pytest.mark.usefixtures("product_indexes", "products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_search_should_match_prefix_in_any_case():
+    result = await product_usecase.search("iPHONE 15 pro", prefix=True)
+
+    assert [product.name for product in result] == ["Iphone 15 Pro Max"]
+
+
+@pytest.mark.usefixtures("products_inserted")
+@pytest.mark.asyncio
+async def test_usecases_stats_should_aggregate_inventory():
+    result = await product_usecase.stats(
+        boundaries=[Decimal("0"), Decimal("6"), Decimal("20")]
+    )
+
+    assert result.count == 4
+    assert result.total_quantity == 43
+    assert result.stock_value == Decimal("236.500")
+    assert [(item.status, item.count) for item in result.by_status] == [
+        (False, 1),
+        (True, 3),
+    ]
+    assert [item.count for item in result.price_histogram] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_usecases_delete_should_hide_soft_deleted_products(product_inserted):
+    await product_usecase.delete(id=product_inserted.id)
+
+    archived = await product_usecase.get(id=product_inserted.id, include_deleted=True)
+    with pytest.raises(NotFoundException):
+        await product_usecase.get(id=product_inserted.id)
+    with pytest.raises(NotFoundException):
+        await product_usecase.delete(id=product_inserted.id)
+
+    assert archived.deleted_at is not None
+    assert await product_usecase.query() == []
+    assert len(await product_usecase.query(include_deleted=True)) == 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_preload_should_cache_newest_products(products_inserted):
+    count = await product_usecase.preload(limit=2)
+    hits = product_usecase.cache.stats.hits
+
+    await product_usecase.get(id=products_inserted[-1].id)
+
+    assert count == 2
+    assert product_usecase.cache.stats.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_usecases_lookup_should_keep_request_order(products_inserted):
+    unknown = UUID("1e4f214e-85f7-461a-89d0-a751a32e3bb9")
+    ids = [products_inserted[2].id, unknown, products_inserted[0].id]
+
+    result = await product_usecase.lookup(ids)
+
+    assert [item.id for item in result] == ids
+    assert [item.found for item in result] == [True, False, True]
+    assert result[0].product == products_inserted[2]
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_should_never_oversell(product_inserted):
+    # product_inserted starts with 10 units; 15 concurrent checkouts race.
+    results = await product_usecase.adjust_stock_many(
+        [ProductBulkStock(id=product_inserted.id, delta=-1) for _ in range(15)]
+    )
+    product = await product_usecase.get(id=product_inserted.id)
+
+    assert [item.status for item in results].count("adjusted") == 10
+    assert product.quantity == 0
+    assert product.version == product_inserted.version + 10
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_many_should_report_mongo_errors(
+    monkeypatch, products_inserted
+):
+    failing = products_inserted[0].id
+    adjust_stock = product_usecase.adjust_stock
+
+    async def flaky(id, delta):
+        if id == failing:
+            raise AutoReconnect("connection reset")
+        return await adjust_stock(id, delta)
+
+    monkeypatch.setattr(product_usecase, "adjust_stock", flaky)
+    results = await product_usecase.adjust_stock_many(
+        [ProductBulkStock(id=product.id, delta=-1) for product in products_inserted]
+    )
+
+    assert [item.status for item in results] == ["error"] + ["adjusted"] * 3
+    assert results[0].detail == "connection reset"
+
+
+@pytest.mark.asyncio
+async def test_usecases_adjust_stock_should_raise_insufficient_stock(
+    product_inserted,
+):
+    with pytest.raises(InsufficientStockException):
+        await product_usecase.adjust_stock(product_inserted.id, delta=-11)
+
+    product = await product_usecase.adjust_stock(product_inserted.id, delta=5)
+    assert product.quantity == 15
+
+
+@pytest.mark.asyncio
+async def test_usecases_get_should_coalesce_concurrent_misses(product_inserted):
+    product_usecase.cache.clear()
+    executed = product_usecase.flight.stats.executed
+
+    results = await asyncio.gather(
+        *(product_usecase.get(id=product_inserted.id) for _ in range(10))
+    )
+
+    assert product_usecase.flight.stats.executed == executed + 1
+    assert all(result is results[0] for result in results)